@@ -17,6 +17,7 @@ from app.core.config import settings
 from app.models.user import User, SellerProfile          # noqa: F401
 from app.models.listing import PhoneListing, OldPhoneDetails, NewPhoneDetails  # noqa: F401
 from app.models.order import Order                       # noqa: F401
+from app.models.chat import ChatRoom, ChatParticipant, Message  # noqa: F401
 
 # ── Alembic Config object ───────────────────
 config = context.config
@@ -54,7 +55,13 @@ def run_migrations_online() -> None:
         poolclass=pool.NullPool,
     )
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        # Commit after each revision so a long upgrade (data migrations
+        # included) doesn't hold one huge transaction and its locks open
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=True,
+        )
         with context.begin_transaction():
             context.run_migrations()
 
@@ -0,0 +1,46 @@
+"""add trigram indexes for listing search
+
+Revision ID: 44682f1134d2
+Revises: 9a289c73cb94
+Create Date: 2026-10-15 06:26:32.472173
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '44682f1134d2'
+down_revision: Union[str, None] = '9a289c73cb94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Search box: brand ILIKE '%q%' OR model ILIKE '%q%'
+    with op.get_context().autocommit_block():
+        for column in ("brand", "model"):
+            op.create_index(
+                f"ix_phone_listings_{column}_trgm",
+                "phone_listings",
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    # The extension is left installed; other objects may depend on it
+    with op.get_context().autocommit_block():
+        for column in ("model", "brand"):
+            op.drop_index(
+                f"ix_phone_listings_{column}_trgm",
+                table_name="phone_listings",
+                postgresql_concurrently=True,
+            )
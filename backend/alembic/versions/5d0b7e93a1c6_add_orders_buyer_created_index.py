@@ -0,0 +1,49 @@
+"""add orders buyer created index
+
+Revision ID: 5d0b7e93a1c6
+Revises: c3e81f0a2b47
+Create Date: 2026-10-15 06:52:41.207315
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d0b7e93a1c6'
+down_revision: Union[str, None] = 'c3e81f0a2b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Single-column indexes whose column now leads a composite one
+REDUNDANT = [
+    ("ix_orders_buyer_id", "orders", "buyer_id"),
+    ("ix_orders_seller_id", "orders", "seller_id"),
+    ("ix_messages_room_id", "messages", "room_id"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # A buyer's orders, newest first (mirrors ix_orders_seller_created)
+        op.create_index(
+            "ix_orders_buyer_created",
+            "orders",
+            ["buyer_id", "created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, table, _ in REDUNDANT:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, column in REDUNDANT:
+            op.create_index(
+                name, table, [column], postgresql_concurrently=True, if_not_exists=True,
+            )
+        op.drop_index("ix_orders_buyer_created", table_name="orders", postgresql_concurrently=True)
@@ -0,0 +1,55 @@
+"""store additional images as text array
+
+Revision ID: 7f3c2d81b5e4
+Revises: e2a94c16f0d8
+Create Date: 2026-10-15 07:04:37.519862
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f3c2d81b5e4'
+down_revision: Union[str, None] = 'e2a94c16f0d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ALTER ... TYPE ... USING can't hold a subquery, so copy through a
+    # new column and swap it in
+    op.add_column(
+        "phone_listings",
+        sa.Column("additional_images_arr", postgresql.ARRAY(sa.String(length=500)), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE phone_listings
+        SET additional_images_arr = ARRAY(
+            SELECT e.url
+            FROM json_array_elements_text(additional_images) WITH ORDINALITY AS e(url, n)
+            ORDER BY e.n
+        )
+        WHERE additional_images IS NOT NULL
+          AND json_typeof(additional_images) = 'array'
+        """
+    )
+    op.drop_column("phone_listings", "additional_images")
+    op.alter_column("phone_listings", "additional_images_arr", new_column_name="additional_images")
+
+
+def downgrade() -> None:
+    op.add_column("phone_listings", sa.Column("additional_images_json", sa.JSON(), nullable=True))
+    op.execute(
+        """
+        UPDATE phone_listings
+        SET additional_images_json = to_json(additional_images)
+        WHERE additional_images IS NOT NULL
+        """
+    )
+    op.drop_column("phone_listings", "additional_images")
+    op.alter_column("phone_listings", "additional_images_json", new_column_name="additional_images")
@@ -0,0 +1,56 @@
+"""add chat hot path indexes
+
+Revision ID: 98a72eddb449
+Revises: 
+Create Date: 2026-10-15 06:13:39.834581
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '98a72eddb449'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction; IF NOT EXISTS skips
+    # databases whose tables were created with these indexes already.
+    with op.get_context().autocommit_block():
+        # History page: WHERE room_id = ? ORDER BY timestamp DESC LIMIT n
+        op.create_index(
+            "ix_messages_room_ts",
+            "messages",
+            ["room_id", "timestamp"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Unread counts: only unread rows are indexed
+        op.create_index(
+            "ix_messages_room_unread",
+            "messages",
+            ["room_id", "sender_id"],
+            postgresql_where=sa.text("read_at IS NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Membership checks and "rooms for user" joins
+        op.create_index(
+            "ix_chat_participants_user_room",
+            "chat_participants",
+            ["user_id", "room_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_chat_participants_user_room", table_name="chat_participants", postgresql_concurrently=True)
+        op.drop_index("ix_messages_room_unread", table_name="messages", postgresql_concurrently=True)
+        op.drop_index("ix_messages_room_ts", table_name="messages", postgresql_concurrently=True)
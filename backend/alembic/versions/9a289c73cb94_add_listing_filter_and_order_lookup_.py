@@ -0,0 +1,63 @@
+"""add listing filter and order lookup indexes
+
+Revision ID: 9a289c73cb94
+Revises: 9abf6a5386a1
+Create Date: 2026-10-15 06:25:44.747187
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a289c73cb94'
+down_revision: Union[str, None] = '9abf6a5386a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Feed filters: lower(brand) = ? on active rows, lower(city) = ?
+        op.create_index(
+            "ix_phone_listings_brand_lower",
+            "phone_listings",
+            [sa.text("lower(brand)")],
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_seller_profiles_city_lower",
+            "seller_profiles",
+            [sa.text("lower(city)")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Duplicate pending-order check
+        op.create_index(
+            "ix_orders_buyer_listing_pending",
+            "orders",
+            ["buyer_id", "listing_id"],
+            postgresql_where=sa.text("status = 'PENDING'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # A seller's orders, newest first
+        op.create_index(
+            "ix_orders_seller_created",
+            "orders",
+            ["seller_id", "created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_orders_seller_created", table_name="orders", postgresql_concurrently=True)
+        op.drop_index("ix_orders_buyer_listing_pending", table_name="orders", postgresql_concurrently=True)
+        op.drop_index("ix_seller_profiles_city_lower", table_name="seller_profiles", postgresql_concurrently=True)
+        op.drop_index("ix_phone_listings_brand_lower", table_name="phone_listings", postgresql_concurrently=True)
@@ -0,0 +1,40 @@
+"""add phone listings keyset index
+
+Revision ID: 9abf6a5386a1
+Revises: a65bdad576ff
+Create Date: 2026-10-15 06:22:13.283763
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9abf6a5386a1'
+down_revision: Union[str, None] = 'a65bdad576ff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Public feed: WHERE is_active AND (created_at, id) < cursor
+    #              ORDER BY created_at DESC, id DESC LIMIT n
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_phone_listings_active_created",
+            "phone_listings",
+            ["is_active", "created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_phone_listings_active_created",
+            table_name="phone_listings",
+            postgresql_concurrently=True,
+        )
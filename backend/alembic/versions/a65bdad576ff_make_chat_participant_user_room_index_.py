@@ -0,0 +1,54 @@
+"""make chat participant user room index unique
+
+Revision ID: a65bdad576ff
+Revises: 98a72eddb449
+Create Date: 2026-10-15 06:16:25.910304
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a65bdad576ff'
+down_revision: Union[str, None] = '98a72eddb449'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A room never lists the same user twice. Making the index unique
+    # enforces that, and the room lookup becomes an index-only probe.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_chat_participants_user_room",
+            "chat_participants",
+            ["user_id", "room_id"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_chat_participants_user_room",
+            table_name="chat_participants",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_chat_participants_user_room",
+            "chat_participants",
+            ["user_id", "room_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "uq_chat_participants_user_room",
+            table_name="chat_participants",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,40 @@
+"""drop covered chat participants user index
+
+Revision ID: b41d9e6c2f07
+Revises: 7f3c2d81b5e4
+Create Date: 2026-10-15 07:48:12.604219
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41d9e6c2f07'
+down_revision: Union[str, None] = '7f3c2d81b5e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # user_id leads uq_chat_participants_user_room (user_id, room_id)
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_chat_participants_user_id",
+            table_name="chat_participants",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_chat_participants_user_id",
+            "chat_participants",
+            ["user_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
@@ -0,0 +1,32 @@
+"""add updated_at to users and listings
+
+Revision ID: c3e81f0a2b47
+Revises: 44682f1134d2
+Create Date: 2026-10-15 06:34:10.918224
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e81f0a2b47'
+down_revision: Union[str, None] = '44682f1134d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows start out unmodified since creation; the app sets
+    # the value itself from then on, so no server default is kept.
+    for table in ("users", "phone_listings"):
+        op.add_column(table, sa.Column("updated_at", sa.DateTime(), nullable=True))
+        op.execute(f"UPDATE {table} SET updated_at = created_at")
+        op.alter_column(table, "updated_at", nullable=False)
+
+
+def downgrade() -> None:
+    for table in ("phone_listings", "users"):
+        op.drop_column(table, "updated_at")
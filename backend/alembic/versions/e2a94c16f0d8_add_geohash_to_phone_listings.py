@@ -0,0 +1,80 @@
+"""add geohash to phone listings
+
+Revision ID: e2a94c16f0d8
+Revises: 5d0b7e93a1c6
+Create Date: 2026-10-15 06:58:02.641590
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+from app.core import geohash
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a94c16f0d8'
+down_revision: Union[str, None] = '5d0b7e93a1c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    op.add_column(
+        "phone_listings",
+        sa.Column("geohash", sqlmodel.sql.sqltypes.AutoString(length=12), nullable=True),
+    )
+
+    # Backfill from the stored coordinates, a batch at a time
+    conn = op.get_bind()
+    listings = sa.table(
+        "phone_listings",
+        sa.column("id", sa.Integer),
+        sa.column("location_lat", sa.Float),
+        sa.column("location_long", sa.Float),
+        sa.column("geohash", sa.String),
+    )
+    update = (
+        sa.update(listings)
+        .where(listings.c.id == sa.bindparam("listing_id"))
+        .values(geohash=sa.bindparam("hash"))
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(listings.c.id, listings.c.location_lat, listings.c.location_long)
+            .where(listings.c.id > last_id)
+            .order_by(listings.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(update, [
+            {"listing_id": row.id, "hash": geohash.encode(row.location_lat, row.location_long)}
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+    # Radius search: geohash LIKE 'prefix%'
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_phone_listings_geohash",
+            "phone_listings",
+            ["geohash"],
+            postgresql_ops={"geohash": "varchar_pattern_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_phone_listings_geohash",
+            table_name="phone_listings",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("phone_listings", "geohash")
@@ -7,18 +7,52 @@ Protected endpoints requiring ADMIN role:
   DELETE /listings/{id}      → Force-deactivate any listing
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from threading import Lock
+from typing import Callable, Hashable
+
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import update
+from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select, func
 
+from app.api.v1.endpoints.listings import invalidate_listing_caches
 from app.core.database import get_session
 from app.core.security import get_current_admin
 from app.models.user import User
 from app.models.listing import PhoneListing
-from app.schemas import UserResponse, ListingResponse
+from app.schemas import (
+    UserResponse,
+    UserResponseList,
+    ListingResponse,
+    ListingResponseList,
+)
 
 router = APIRouter()
 
 
+# ── Response Cache ──────────────────────────
+# Admin list pages are read-heavy and needn't be real-time, so each page
+# is cached briefly as rendered JSON, keyed on (route, skip, limit).
+# Every route here is behind get_current_admin and returns the same
+# data to any admin, so there is no per-user content in the cache.
+ADMIN_CACHE_TTL_SECONDS = 30
+
+_admin_cache: TTLCache = TTLCache(maxsize=256, ttl=ADMIN_CACHE_TTL_SECONDS)
+_admin_cache_lock = Lock()  # sync routes run concurrently in the threadpool
+
+
+def _cached_page(key: Hashable, load: Callable[[], bytes]) -> Response:
+    """Return the cached page for `key`, loading and storing it on a miss."""
+    with _admin_cache_lock:
+        page = _admin_cache.get(key)
+    if page is None:
+        page = load()
+        with _admin_cache_lock:
+            _admin_cache[key] = page
+    return Response(content=page, media_type="application/json")
+
+
 # ═══════════════════════════════════════════════
 #  GET /users — List all users
 # ═══════════════════════════════════════════════
@@ -33,10 +67,12 @@ def list_users(
     admin: User = Depends(get_current_admin),
     session: Session = Depends(get_session),
 ):
-    users = session.exec(
-        select(User).offset(skip).limit(limit)
-    ).all()
-    return users
+    return _cached_page(("users", skip, limit), lambda: UserResponseList.dump_json(
+        UserResponseList.validate_python(
+            session.exec(select(User).offset(skip).limit(limit)).all(),
+            from_attributes=True,
+        )
+    ))
 
 
 # ═══════════════════════════════════════════════
@@ -53,10 +89,19 @@ def list_all_listings(
     admin: User = Depends(get_current_admin),
     session: Session = Depends(get_session),
 ):
-    listings = session.exec(
-        select(PhoneListing).order_by(PhoneListing.created_at.desc()).offset(skip).limit(limit)
-    ).all()
-    return listings
+    return _cached_page(("listings", skip, limit), lambda: ListingResponseList.dump_json(
+        ListingResponseList.validate_python(
+            session.exec(
+                select(PhoneListing)
+                .options(
+                    selectinload(PhoneListing.old_phone_details),
+                    selectinload(PhoneListing.new_phone_details),
+                )
+                .order_by(PhoneListing.created_at.desc()).offset(skip).limit(limit)
+            ).all(),
+            from_attributes=True,
+        )
+    ))
 
 
 # ═══════════════════════════════════════════════
@@ -72,10 +117,18 @@ def admin_delete_listing(
     admin: User = Depends(get_current_admin),
     session: Session = Depends(get_session),
 ):
-    listing = session.get(PhoneListing, listing_id)
-    if not listing:
+    # One UPDATE ... RETURNING — no SELECT, no ORM hydration
+    deactivated = session.exec(
+        update(PhoneListing)
+        .where(PhoneListing.id == listing_id)
+        .values(is_active=False)
+        .returning(PhoneListing.id)
+    ).first()
+    if deactivated is None:
         raise HTTPException(status_code=404, detail="Listing not found.")
-
-    listing.is_active = False
-    session.add(listing)
     session.commit()
+
+    # Don't serve the listing as active from a cached page
+    with _admin_cache_lock:
+        _admin_cache.clear()
+    invalidate_listing_caches()
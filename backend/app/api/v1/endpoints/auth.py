@@ -33,43 +33,42 @@ def register(payload: UserCreate, session: Session = Depends(get_session)):
     - Returns the created user (without the hashed password).
     """
 
-    # ── Check for duplicate phone ────────────
-    existing = session.exec(
-        select(User).where(User.phone == payload.phone)
-    ).first()
-    if existing:
+    # Hash before the first query so bcrypt doesn't run while this
+    # request holds a pooled DB connection
+    hashed_password = hash_password(payload.password)
+
+    # ── Check for duplicate phone / email (one query) ──
+    conflict = User.phone == payload.phone
+    if payload.email:
+        conflict = conflict | (User.email == payload.email)
+    existing = session.exec(select(User.phone, User.email).where(conflict)).all()
+
+    if any(phone == payload.phone for phone, _ in existing):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="A user with this phone number already exists.",
         )
-
-    # ── Check for duplicate email (if provided) ──
-    if payload.email:
-        email_exists = session.exec(
-            select(User).where(User.email == payload.email)
-        ).first()
-        if email_exists:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="A user with this email already exists.",
-            )
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A user with this email already exists.",
+        )
 
     # ── Create User ──────────────────────────
     user = User(
         name=payload.name,
         phone=payload.phone,
         email=payload.email,
-        hashed_password=hash_password(payload.password),
+        hashed_password=hashed_password,
         role=payload.role,
     )
-    session.add(user)
-    session.flush()  # Get user.id before creating profile
 
-    # ── Create SellerProfile (if Seller) ─────
+    # ── Attach SellerProfile (if Seller) ─────
+    # Saved through the relationship cascade: the flush inserts the user
+    # (INSERT ... RETURNING id), then the profile with its user_id filled in.
     if payload.role == UserRole.SELLER and payload.seller_profile:
         profile_data = payload.seller_profile
-        profile = SellerProfile(
-            user_id=user.id,
+        user.seller_profile = SellerProfile(
             address=profile_data.address,
             city=profile_data.city,
             latitude=profile_data.latitude,
@@ -77,10 +76,9 @@ def register(payload: UserCreate, session: Session = Depends(get_session)):
             is_shop=profile_data.is_shop,
             shop_name=profile_data.shop_name,
         )
-        session.add(profile)
 
+    session.add(user)
     session.commit()
-    session.refresh(user)
     return user
 
 
@@ -106,6 +104,9 @@ def login(
     user = session.exec(
         select(User).where(User.phone == form_data.username)
     ).first()
+    # Return the connection to the pool before the slow bcrypt check;
+    # the loaded attributes stay readable on the detached user.
+    session.close()
 
     if not user or not verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
@@ -6,24 +6,45 @@ Real-time chat system with HTTP + WebSocket endpoints:
   GET  /rooms              → List rooms the current user belongs to
   GET  /rooms/{room_id}    → Get or create a direct-message room
   GET  /history/{room_id}  → Fetch paginated message history
+                             (NDJSON stream with Accept: application/x-ndjson)
   WS   /ws/{user_id}       → Real-time bidirectional messaging
 """
 
-import json
-from datetime import datetime, timezone
-from typing import Optional
-
-from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
-from sqlmodel import Session, select, col
-
-from app.core.database import get_session
+import asyncio
+import logging
+import secrets
+from collections import defaultdict
+from typing import Iterator, List, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, update
+from sqlalchemy.orm import aliased
+from starlette.concurrency import run_in_threadpool
+from sqlmodel import Session, select, col, func
+
+from app.core.database import engine, get_session
 from app.core.security import get_current_user, decode_access_token
+from app.core.message_writer import message_writer
 from app.core.socket import manager
+from app.models import utcnow
 from app.models.user import User
 from app.models.chat import ChatRoom, ChatParticipant, Message
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Fixed WebSocket error frames, encoded once instead of per send
+_ERR_MISSING_FIELDS = orjson.dumps(
+    {"type": "error", "detail": "room_id and content are required."}
+).decode()
+_ERR_NOT_MEMBER = orjson.dumps(
+    {"type": "error", "detail": "You are not a member of this room."}
+).decode()
+_ERR_INVALID_JSON = orjson.dumps({"type": "error", "detail": "Invalid JSON."}).decode()
+
 
 # ═══════════════════════════════════════════════
 #  HTTP — List user's rooms
@@ -42,50 +63,78 @@ def list_rooms(
         .order_by(ChatRoom.created_at.desc())
     )
     rooms = session.exec(stmt).all()
+    if not rooms:
+        return []
+
+    room_ids = [room.id for room in rooms]
+
+    # Participants of every room, in one query
+    participant_ids = defaultdict(list)
+    for rid, uid in session.exec(
+        select(ChatParticipant.room_id, ChatParticipant.user_id)
+        .where(col(ChatParticipant.room_id).in_(room_ids))
+        .order_by(ChatParticipant.user_id)
+    ).all():
+        participant_ids[rid].append(uid)
+
+    all_user_ids = {uid for uids in participant_ids.values() for uid in uids}
+    users = {
+        u.id: u
+        for u in session.exec(select(User).where(col(User.id).in_(all_user_ids))).all()
+    }
 
-    result = []
-    for room in rooms:
-        # Get other participants' names
-        participants = session.exec(
-            select(ChatParticipant).where(ChatParticipant.room_id == room.id)
-        ).all()
-        participant_ids = [p.user_id for p in participants]
-        other_users = session.exec(
-            select(User).where(col(User.id).in_(participant_ids))
+    # Last message per room (window function, one query)
+    ranked = (
+        select(
+            Message.room_id,
+            Message.content,
+            Message.sender_id,
+            Message.timestamp,
+            func.row_number()
+            .over(partition_by=Message.room_id, order_by=col(Message.timestamp).desc())
+            .label("rn"),
+        )
+        .where(col(Message.room_id).in_(room_ids))
+        .subquery()
+    )
+    last_messages = {
+        row.room_id: row
+        for row in session.exec(
+            select(ranked.c.room_id, ranked.c.content, ranked.c.sender_id, ranked.c.timestamp)
+            .where(ranked.c.rn == 1)
         ).all()
+    }
 
-        # Get last message
-        last_msg = session.exec(
-            select(Message)
-            .where(Message.room_id == room.id)
-            .order_by(Message.timestamp.desc())
-            .limit(1)
-        ).first()
-
-        # Count unread
-        unread = session.exec(
-            select(Message)
-            .where(Message.room_id == room.id)
+    # Unread counts per room (grouped, one query)
+    unread_counts = dict(
+        session.exec(
+            select(Message.room_id, func.count())
+            .where(col(Message.room_id).in_(room_ids))
             .where(Message.sender_id != current_user.id)
             .where(Message.read_at == None)  # noqa: E711
+            .group_by(Message.room_id)
         ).all()
+    )
 
+    result = []
+    for room in rooms:
+        last_msg = last_messages.get(room.id)
         result.append({
             "id": room.id,
             "name": room.name,
             "order_id": room.order_id,
             "is_active": room.is_active,
-            "created_at": room.created_at.isoformat(),
+            "created_at": room.created_at,
             "participants": [
                 {"id": u.id, "name": u.name, "role": u.role.value}
-                for u in other_users
+                for u in (users[uid] for uid in participant_ids[room.id] if uid in users)
             ],
             "last_message": {
                 "content": last_msg.content,
                 "sender_id": last_msg.sender_id,
-                "timestamp": last_msg.timestamp.isoformat(),
+                "timestamp": last_msg.timestamp,
             } if last_msg else None,
-            "unread_count": len(unread),
+            "unread_count": unread_counts.get(room.id, 0),
         })
 
     return result
@@ -112,33 +161,36 @@ def get_or_create_room(
     if not other_user:
         raise HTTPException(status_code=404, detail="User not found.")
 
-    # Check if a room already exists between these two users
-    my_rooms = session.exec(
-        select(ChatParticipant.room_id).where(ChatParticipant.user_id == current_user.id)
-    ).all()
-
-    if my_rooms:
-        other_rooms = session.exec(
-            select(ChatParticipant.room_id)
-            .where(ChatParticipant.user_id == other_user_id)
-            .where(col(ChatParticipant.room_id).in_(my_rooms))
-        ).all()
-
-        if other_rooms:
-            room_id = other_rooms[0]
-            room = session.get(ChatRoom, room_id)
-            return {"room_id": room.id, "created": False}
-
-    # Create new room
-    room = ChatRoom(name=f"{current_user.name} & {other_user.name}")
-    session.add(room)
-    session.flush()
-
-    session.add(ChatParticipant(user_id=current_user.id, room_id=room.id))
-    session.add(ChatParticipant(user_id=other_user_id, room_id=room.id))
+    # Check if a room already exists between these two users — one
+    # self-join on the (user_id, room_id) index
+    mine = aliased(ChatParticipant)
+    theirs = aliased(ChatParticipant)
+    room_id = session.exec(
+        select(mine.room_id)
+        .join(theirs, theirs.room_id == mine.room_id)
+        .where(mine.user_id == current_user.id, theirs.user_id == other_user_id)
+        .limit(1)
+    ).first()
+    if room_id is not None:
+        return {"room_id": room_id, "created": False}
+
+    # Create new room — INSERT ... RETURNING hands back the id, so nothing
+    # needs reloading after the commit
+    room_id = session.exec(
+        insert(ChatRoom)
+        .values(name=f"{current_user.name} & {other_user.name}")
+        .returning(ChatRoom.id)
+    ).scalar_one()
+    session.exec(
+        insert(ChatParticipant),
+        params=[
+            {"user_id": current_user.id, "room_id": room_id},
+            {"user_id": other_user_id, "room_id": room_id},
+        ],
+    )
     session.commit()
 
-    return {"room_id": room.id, "created": True}
+    return {"room_id": room_id, "created": True}
 
 
 # ═══════════════════════════════════════════════
@@ -147,13 +199,17 @@ def get_or_create_room(
 @router.get("/history/{room_id}", summary="Get message history")
 def get_history(
     room_id: int,
+    request: Request,
     limit: int = Query(50, ge=1, le=200),
     before_id: Optional[int] = Query(None, description="Cursor: fetch messages before this ID"),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
     """Fetch paginated message history for a room.
-    The user must be a participant."""
+    The user must be a participant.
+
+    Clients sending `Accept: application/x-ndjson` get the page streamed
+    as one JSON object per line, oldest first."""
     # Verify membership
     membership = session.exec(
         select(ChatParticipant)
@@ -163,45 +219,129 @@ def get_history(
     if not membership:
         raise HTTPException(status_code=403, detail="You are not a member of this room.")
 
-    query = select(Message).where(Message.room_id == room_id)
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _stream_history(room_id, current_user.id, before_id, limit),
+            media_type="application/x-ndjson",
+        )
+
+    # Senders ride along with their messages in a single joined query
+    query = (
+        select(Message, User.name, User.role)
+        .join(User, User.id == Message.sender_id)
+        .where(Message.room_id == room_id)
+    )
     if before_id:
         query = query.where(Message.id < before_id)
     query = query.order_by(Message.timestamp.desc()).limit(limit)
 
-    messages = session.exec(query).all()
+    rows = session.exec(query).all()
 
     # Mark fetched messages as read (for messages not sent by current user)
-    for msg in messages:
-        if msg.sender_id != current_user.id and msg.read_at is None:
-            msg.read_at = datetime.now(timezone.utc)
-            session.add(msg)
-    session.commit()
+    now = utcnow()
+    to_mark = {
+        m.id
+        for m, _, _ in rows
+        if m.sender_id != current_user.id and m.read_at is None
+    }
 
-    # Get sender info
-    sender_ids = list(set(m.sender_id for m in messages))
-    senders = {}
-    if sender_ids:
-        users = session.exec(select(User).where(col(User.id).in_(sender_ids))).all()
-        senders = {u.id: {"name": u.name, "role": u.role.value} for u in users}
+    messages = []
+    for m, sender_name, sender_role in reversed(rows):  # Return in chronological order
+        read_at = now if m.id in to_mark else m.read_at
+        messages.append(_history_item(m, sender_name, sender_role, read_at))
+
+    if to_mark:
+        session.exec(
+            update(Message)
+            .where(col(Message.id).in_(to_mark))
+            .values(read_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
 
+    return {"room_id": room_id, "messages": messages}
+
+
+def _history_item(m: Message, sender_name: str, sender_role, read_at) -> dict:
     return {
-        "room_id": room_id,
-        "messages": [
-            {
-                "id": m.id,
-                "room_id": m.room_id,
-                "sender_id": m.sender_id,
-                "sender_name": senders.get(m.sender_id, {}).get("name", "Unknown"),
-                "sender_role": senders.get(m.sender_id, {}).get("role", "BUYER"),
-                "content": m.content,
-                "timestamp": m.timestamp.isoformat(),
-                "read_at": m.read_at.isoformat() if m.read_at else None,
-            }
-            for m in reversed(messages)  # Return in chronological order
-        ],
+        "id": m.id,
+        "room_id": m.room_id,
+        "sender_id": m.sender_id,
+        "sender_name": sender_name,
+        "sender_role": sender_role.value,
+        "content": m.content,
+        "timestamp": m.timestamp,
+        "read_at": read_at,
     }
 
 
+def _stream_history(
+    room_id: int, user_id: int, before_id: Optional[int], limit: int
+) -> Iterator[bytes]:
+    """Yield a history page as NDJSON, oldest first, then mark what was
+    sent as read. Runs on its own session: the request's session may be
+    closed before the response body has been sent."""
+    latest = select(Message.id).where(Message.room_id == room_id)
+    if before_id:
+        latest = latest.where(Message.id < before_id)
+    latest = latest.order_by(Message.timestamp.desc()).limit(limit)
+
+    query = (
+        select(Message, User.name, User.role)
+        .join(User, User.id == Message.sender_id)
+        .where(col(Message.id).in_(latest))
+        .order_by(Message.timestamp)
+        .execution_options(yield_per=100)
+    )
+
+    now = utcnow()
+    to_mark = []
+    with Session(engine) as session:
+        for m, sender_name, sender_role in session.exec(query):
+            read_at = m.read_at
+            if m.sender_id != user_id and read_at is None:
+                to_mark.append(m.id)
+                read_at = now
+            yield orjson.dumps(_history_item(m, sender_name, sender_role, read_at)) + b"\n"
+
+        if to_mark:
+            session.exec(
+                update(Message)
+                .where(col(Message.id).in_(to_mark))
+                .values(read_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+
+
+# ─────────────────────────────────────────────
+#  WebSocket DB helpers
+#  Blocking SQLModel work, run via run_in_threadpool so the
+#  event loop keeps serving other sockets while Postgres answers.
+#  Each call borrows a pooled connection only for its own query,
+#  so idle sockets don't pin connections.
+# ─────────────────────────────────────────────
+def _ws_authenticate(user_id: int, token: Optional[str]) -> Optional[User]:
+    """Return the connecting user, validating the JWT when one is given.
+    Without a token, just verify the user exists (dev mode)."""
+    if token:
+        payload = decode_access_token(token)
+        token_user_id = payload.get("sub")
+        if token_user_id is None or int(token_user_id) != user_id:
+            return None
+    with Session(engine) as session:
+        return session.get(User, user_id)
+
+
+def _ws_room_participants(room_id: int) -> List[int]:
+    """Return the user ids of everyone in a room (also serves as the
+    membership check for the sender)."""
+    with Session(engine) as session:
+        return list(session.exec(
+            select(ChatParticipant.user_id).where(ChatParticipant.room_id == room_id)
+        ).all())
+
+
 # ═══════════════════════════════════════════════
 #  WebSocket — Real-time messaging
 # ═══════════════════════════════════════════════
@@ -219,111 +359,106 @@ async def websocket_endpoint(
         { "room_id": 1, "content": "Hello!" }
 
     Receive JSON messages:
-        { "type": "message", "id": 123, "room_id": 1,
+        { "type": "message", "id": -8071..., "room_id": 1,
           "sender_id": 2, "sender_name": "Ali", "sender_role": "SELLER",
           "content": "Hello!", "timestamp": "...", "read_at": null }
+
+    The message is broadcast while it is still being saved, under a
+    negative provisional id. Once committed, participants receive:
+        { "type": "message_ack", "room_id": 1,
+          "provisional_id": -8071..., "id": 123 }
+    or, if the save failed:
+        { "type": "message_failed", "room_id": 1,
+          "provisional_id": -8071..., "detail": "..." }
     """
-    # ── Authenticate via token query param ────
-    session = next(get_session())
     try:
-        if token:
-            payload = decode_access_token(token)
-            token_user_id = payload.get("sub")
-            if token_user_id is None or int(token_user_id) != user_id:
-                await websocket.close(code=4001)
-                return
-        else:
-            # Fallback: just verify the user exists (dev mode)
-            user = session.get(User, user_id)
-            if not user:
-                await websocket.close(code=4001)
-                return
-
-        user = session.get(User, user_id)
+        # ── Authenticate via token query param ────
+        try:
+            user = await run_in_threadpool(_ws_authenticate, user_id, token)
+        except Exception:
+            user = None
         if not user:
             await websocket.close(code=4001)
             return
 
-    except Exception:
-        await websocket.close(code=4001)
-        return
+        sender_name = user.name
+        sender_role = user.role.value
 
-    # ── Connect ──────────────────────────────
-    await manager.connect(websocket, user_id)
+        # ── Connect ──────────────────────────────
+        await manager.connect(websocket, user_id)
 
-    try:
         while True:
             data = await websocket.receive_text()
 
             try:
-                payload = json.loads(data)
+                payload = orjson.loads(data)
                 room_id = payload.get("room_id")
                 content = payload.get("content", "").strip()
 
                 if not room_id or not content:
-                    await websocket.send_json({
-                        "type": "error",
-                        "detail": "room_id and content are required.",
-                    })
+                    await websocket.send_text(_ERR_MISSING_FIELDS)
                     continue
 
                 # ── Verify membership ────────────
-                membership = session.exec(
-                    select(ChatParticipant)
-                    .where(ChatParticipant.room_id == room_id)
-                    .where(ChatParticipant.user_id == user_id)
-                ).first()
-
-                if not membership:
-                    await websocket.send_json({
-                        "type": "error",
-                        "detail": "You are not a member of this room.",
-                    })
+                participant_ids = manager.room_members.get(room_id)
+                if participant_ids is None:
+                    participant_ids = await run_in_threadpool(
+                        _ws_room_participants, room_id
+                    )
+                    if participant_ids:
+                        manager.room_members[room_id] = participant_ids
+                if user_id not in participant_ids:
+                    await websocket.send_text(_ERR_NOT_MEMBER)
                     continue
 
-                # ── Save message to DB ───────────
-                msg = Message(
-                    room_id=room_id,
-                    sender_id=user_id,
-                    content=content,
-                )
-                session.add(msg)
-                session.commit()
-                session.refresh(msg)
-
                 # ── Build response payload ───────
+                # Recipients get the message while it is still being
+                # written; a message_ack frame carries the real id after.
+                timestamp = utcnow()
+                provisional_id = -(secrets.randbits(52) + 1)
                 message_data = {
                     "type": "message",
-                    "id": msg.id,
-                    "room_id": msg.room_id,
-                    "sender_id": msg.sender_id,
-                    "sender_name": user.name,
-                    "sender_role": user.role.value,
-                    "content": msg.content,
-                    "timestamp": msg.timestamp.isoformat(),
+                    "id": provisional_id,
+                    "room_id": room_id,
+                    "sender_id": user_id,
+                    "sender_name": sender_name,
+                    "sender_role": sender_role,
+                    "content": content,
+                    "timestamp": timestamp,
                     "read_at": None,
                 }
 
-                # ── Broadcast to room participants ─
-                participants = session.exec(
-                    select(ChatParticipant)
-                    .where(ChatParticipant.room_id == room_id)
-                ).all()
-                participant_ids = [p.user_id for p in participants]
-
-                await manager.broadcast_to_room(
-                    message_data, participant_ids, exclude_id=None
+                # ── Save (batched) & broadcast concurrently ─
+                message_id, sent = await asyncio.gather(
+                    message_writer.save(room_id, user_id, content, timestamp),
+                    manager.broadcast_to_room(message_data, participant_ids, exclude_id=None),
+                    return_exceptions=True,
                 )
+                if isinstance(sent, BaseException):
+                    raise sent
+                if isinstance(message_id, Exception):
+                    # Already delivered — tell everyone to drop it, and
+                    # keep the sender's socket open
+                    logger.error("failed to save chat message", exc_info=message_id)
+                    await manager.broadcast_to_room({
+                        "type": "message_failed",
+                        "room_id": room_id,
+                        "provisional_id": provisional_id,
+                        "detail": "Message could not be saved.",
+                    }, participant_ids, exclude_id=None)
+                    continue
+
+                await manager.broadcast_to_room({
+                    "type": "message_ack",
+                    "room_id": room_id,
+                    "provisional_id": provisional_id,
+                    "id": message_id,
+                }, participant_ids, exclude_id=None)
 
-            except json.JSONDecodeError:
-                await websocket.send_json({
-                    "type": "error",
-                    "detail": "Invalid JSON.",
-                })
+            except orjson.JSONDecodeError:
+                await websocket.send_text(_ERR_INVALID_JSON)
 
     except WebSocketDisconnect:
         manager.disconnect(user_id)
     except Exception:
         manager.disconnect(user_id)
-    finally:
-        session.close()
@@ -9,14 +9,22 @@ Full CRUD for phone listings:
   DELETE /{id}          → Soft-delete own listing (🔒 owner only)
 """
 
+import base64
 import math
-from typing import Optional
+from datetime import datetime
+from threading import Lock
+from typing import Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlmodel import Session, select, func, col
-from sqlalchemy import literal_column, text
+from sqlalchemy import lambda_stmt, literal_column, text, tuple_
+from sqlalchemy.orm import joinedload
 
+from app.core import geohash
 from app.core.database import get_session
+from app.core.response_cache import http_date, listing_responses, not_modified_since
 from app.core.security import get_current_user
 from app.models.user import User, SellerProfile
 from app.models.listing import PhoneListing, OldPhoneDetails, NewPhoneDetails, PhoneType
@@ -24,13 +32,32 @@ from app.schemas import (
     ListingCreate,
     ListingUpdate,
     ListingResponse,
-    ListingWithDistanceResponse,
+    ListingCardOldDetails,
+    ListingCardResponse,
     PaginatedListingResponse,
 )
 
 router = APIRouter()
 
 
+# ── Count Cache ─────────────────────────────
+# Filter set → matching active listings. Paging through one search
+# repeats the same COUNT on every page; a few seconds of drift in
+# `total` is fine for a browse feed.
+LISTING_COUNT_TTL_SECONDS = 30
+
+_count_cache: TTLCache = TTLCache(maxsize=512, ttl=LISTING_COUNT_TTL_SECONDS)
+_count_cache_lock = Lock()  # sync routes run concurrently in the threadpool
+
+
+def invalidate_listing_caches():
+    """Forget cached listing pages and counts. Call after any write that
+    adds, changes, or hides a listing."""
+    listing_responses.clear()
+    with _count_cache_lock:
+        _count_cache.clear()
+
+
 # ─────────────────────────────────────────────
 #  Helpers
 # ─────────────────────────────────────────────
@@ -42,6 +69,36 @@ def _load_details(listing: PhoneListing):
         _ = listing.new_phone_details
 
 
+def _get_listing_with_details(session: Session, listing_id: int) -> Optional[PhoneListing]:
+    """Fetch a listing joined to its detail row — one round trip instead
+    of a get plus a lazy load in _load_details."""
+    return session.exec(
+        select(PhoneListing)
+        .where(PhoneListing.id == listing_id)
+        .options(
+            joinedload(PhoneListing.old_phone_details),
+            joinedload(PhoneListing.new_phone_details),
+        )
+    ).first()
+
+
+def _encode_cursor(listing) -> str:
+    """Opaque keyset cursor pointing just past `listing` (a model or row)."""
+    raw = orjson.dumps([listing.created_at.isoformat(), listing.id])
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, listing_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at), int(listing_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        )
+
+
 # ═══════════════════════════════════════════════
 #  POST /
 # ═══════════════════════════════════════════════
@@ -113,7 +170,7 @@ def create_listing(
         ))
 
     session.commit()
-    session.refresh(listing)
+    invalidate_listing_caches()
     _load_details(listing)
     return listing
 
@@ -135,6 +192,24 @@ def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
 
+def _distance_km(user_lat: float, user_long: float):
+    """SQL-level Haversine distance from a point to each listing.
+    Works on any PostgreSQL without PostGIS."""
+    return 6371.0 * func.acos(
+        func.least(
+            literal_column("1.0"),
+            func.cos(func.radians(user_lat))
+            * func.cos(func.radians(PhoneListing.location_lat))
+            * func.cos(
+                func.radians(PhoneListing.location_long)
+                - func.radians(user_long)
+            )
+            + func.sin(func.radians(user_lat))
+            * func.sin(func.radians(PhoneListing.location_lat)),
+        )
+    )
+
+
 # ═══════════════════════════════════════════════
 #  GET / — List with filters, search & geo-sort
 # ═══════════════════════════════════════════════
@@ -143,7 +218,9 @@ def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     response_model=PaginatedListingResponse,
     summary="List active listings (public) with filters & nearby sort",
 )
+@listing_responses(PaginatedListingResponse)
 def list_listings(
+    request: Request,
     # Filters
     brand: Optional[str] = Query(None, description="Filter by brand (case-insensitive)"),
     type: Optional[PhoneType] = Query(None, description="Filter by NEW or OLD"),
@@ -156,94 +233,175 @@ def list_listings(
     # Geospatial
     user_lat: Optional[float] = Query(None, description="User latitude for nearby sort"),
     user_long: Optional[float] = Query(None, description="User longitude for nearby sort"),
+    radius_km: Optional[float] = Query(
+        None, gt=0, le=500, description="Only listings within this distance (needs user_lat/user_long)"
+    ),
     # Pagination
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="Keyset cursor from a previous page's next_cursor (replaces page)"
+    ),
+    include_total: bool = Query(False, description="Also count matches on cursor pages"),
     session: Session = Depends(get_session),
 ):
-    query = select(PhoneListing).where(PhoneListing.is_active == True)  # noqa: E712
-
-    # ── Apply filters ────────────────────────
-    if brand:
-        query = query.where(func.lower(PhoneListing.brand) == brand.lower())
-    if type:
-        query = query.where(PhoneListing.type == type)
-    if min_price is not None:
-        query = query.where(PhoneListing.price >= min_price)
-    if max_price is not None:
-        query = query.where(PhoneListing.price <= max_price)
-    if ram:
-        query = query.where(func.lower(PhoneListing.ram) == ram.lower())
-    if storage:
-        query = query.where(func.lower(PhoneListing.storage) == storage.lower())
-    if search:
-        pattern = f"%{search}%"
-        query = query.where(
-            col(PhoneListing.brand).ilike(pattern) | col(PhoneListing.model).ilike(pattern)
+    geo_sort = user_lat is not None and user_long is not None
+    if cursor and geo_sort:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination is not available with nearby sort; use page.",
         )
-    if city:
-        query = (
-            query
-            .join(User, PhoneListing.seller_id == User.id)
-            .join(SellerProfile, SellerProfile.user_id == User.id)
-            .where(func.lower(SellerProfile.city) == city.lower())
+    if radius_km is not None and not geo_sort:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="radius_km requires user_lat and user_long.",
         )
 
+    # ── Apply filters ────────────────────────
+    # Statements are built from lambda_stmt pieces. SQLAlchemy caches each
+    # piece by code location, so a repeat request skips rebuilding the
+    # SELECT and its cache key and only binds new values. Keep closures
+    # to plain values.
+    brand_l = brand.lower() if brand else None
+    ram_l = ram.lower() if ram else None
+    storage_l = storage.lower() if storage else None
+    city_l = city.lower() if city else None
+    pattern = f"%{search}%" if search else None
+    # Geohash cells covering the search radius, padded to a fixed four
+    # so the statement shape (and its cache entry) never changes
+    cells = None
+    if radius_km is not None:
+        cells = sorted(geohash.covering_prefixes(user_lat, user_long, radius_km))
+    if cells:
+        cell_a, cell_b, cell_c, cell_d = cells + cells[-1:] * (4 - len(cells))
+
+    def _filtered(stmt):
+        stmt += lambda s: s.where(PhoneListing.is_active == True)  # noqa: E712
+        if brand_l:
+            stmt += lambda s: s.where(func.lower(PhoneListing.brand) == brand_l)
+        if type:
+            stmt += lambda s: s.where(PhoneListing.type == type)
+        if min_price is not None:
+            stmt += lambda s: s.where(PhoneListing.price >= min_price)
+        if max_price is not None:
+            stmt += lambda s: s.where(PhoneListing.price <= max_price)
+        if ram_l:
+            stmt += lambda s: s.where(func.lower(PhoneListing.ram) == ram_l)
+        if storage_l:
+            stmt += lambda s: s.where(func.lower(PhoneListing.storage) == storage_l)
+        if pattern:
+            # Served by the brand/model trigram GIN indexes
+            stmt += lambda s: s.where(
+                col(PhoneListing.brand).ilike(pattern) | col(PhoneListing.model).ilike(pattern)
+            )
+        if cells:
+            # Index range scans over the covering cells narrow the rows
+            # before the exact distance check below
+            stmt += lambda s: s.where(
+                col(PhoneListing.geohash).startswith(cell_a)
+                | col(PhoneListing.geohash).startswith(cell_b)
+                | col(PhoneListing.geohash).startswith(cell_c)
+                | col(PhoneListing.geohash).startswith(cell_d)
+            )
+        if radius_km is not None:
+            stmt += lambda s: s.where(_distance_km(user_lat, user_long) <= radius_km)
+        if city_l:
+            stmt += lambda s: s.join(
+                SellerProfile, SellerProfile.user_id == PhoneListing.seller_id
+            ).where(func.lower(SellerProfile.city) == city_l)
+        return stmt
+
+    # Card columns only — one row per listing, old-phone badges joined in
+    query = _filtered(lambda_stmt(lambda: select(
+        PhoneListing.id,
+        PhoneListing.type,
+        PhoneListing.brand,
+        PhoneListing.model,
+        PhoneListing.price,
+        PhoneListing.ram,
+        PhoneListing.storage,
+        PhoneListing.main_image_url,
+        PhoneListing.location_lat,
+        PhoneListing.location_long,
+        PhoneListing.created_at,
+        OldPhoneDetails.pta_approved,
+        OldPhoneDetails.battery_health,
+    ).outerjoin(OldPhoneDetails, OldPhoneDetails.listing_id == PhoneListing.id)))
+
     # ── Count total ──────────────────────────
-    count_query = select(func.count()).select_from(query.subquery())
-    total = session.exec(count_query).one()
+    # Page mode needs it for `pages`; cursor pages skip it unless asked.
+    # A plain COUNT over the same predicates, cached per filter set.
+    total = None
+    if cursor is None or include_total:
+        count_key = (brand_l, type, min_price, max_price, ram_l, storage_l, city_l, search)
+        if radius_km is not None:
+            count_key += (user_lat, user_long, radius_km)
+        with _count_cache_lock:
+            total = _count_cache.get(count_key)
+        if total is None:
+            total = session.exec(
+                _filtered(lambda_stmt(lambda: select(func.count(PhoneListing.id))))
+            ).scalar_one()
+            with _count_cache_lock:
+                _count_cache[count_key] = total
 
     # ── Order ────────────────────────────────
-    offset = (page - 1) * per_page
-
-    if user_lat is not None and user_long is not None:
-        # Use SQL-level Haversine for distance-based ordering
-        # This works on any PostgreSQL without PostGIS
-        haversine_expr = (
-            6371.0
-            * func.acos(
-                func.least(
-                    literal_column("1.0"),
-                    func.cos(func.radians(user_lat))
-                    * func.cos(func.radians(PhoneListing.location_lat))
-                    * func.cos(
-                        func.radians(PhoneListing.location_long)
-                        - func.radians(user_long)
-                    )
-                    + func.sin(func.radians(user_lat))
-                    * func.sin(func.radians(PhoneListing.location_lat)),
-                )
-            )
+    if geo_sort:
+        query += lambda s: s.order_by(_distance_km(user_lat, user_long).asc())
+    else:
+        query += lambda s: s.order_by(PhoneListing.created_at.desc(), PhoneListing.id.desc())
+
+    # ── Page ─────────────────────────────────
+    # A cursor seeks straight to the next rows through the
+    # (is_active, created_at, id) index; page falls back to OFFSET.
+    if cursor:
+        cursor_ts, cursor_id = _decode_cursor(cursor)
+        query += lambda s: s.where(
+            tuple_(PhoneListing.created_at, PhoneListing.id) < tuple_(cursor_ts, cursor_id)
         )
-        query = query.order_by(haversine_expr.asc())
     else:
-        query = query.order_by(PhoneListing.created_at.desc())
+        offset = (page - 1) * per_page
+        query += lambda s: s.offset(offset)
+    query += lambda s: s.limit(per_page)
 
-    items = session.exec(query.offset(offset).limit(per_page)).all()
+    items = session.exec(query).all()
 
     # ── Build response (add distance_km if geo provided) ──
     response_items = []
     for item in items:
-        _load_details(item)
-        if user_lat is not None and user_long is not None:
-            dist = round(
-                _haversine(user_lat, user_long, item.location_lat, item.location_long), 1
-            )
-            response_items.append(
-                ListingWithDistanceResponse(
-                    **ListingResponse.model_validate(item).model_dump(),
-                    distance_km=dist,
+        response_items.append(ListingCardResponse(
+            id=item.id,
+            type=item.type,
+            brand=item.brand,
+            model=item.model,
+            price=item.price,
+            ram=item.ram,
+            storage=item.storage,
+            main_image_url=item.main_image_url,
+            old_phone_details=(
+                ListingCardOldDetails(
+                    pta_approved=item.pta_approved,
+                    battery_health=item.battery_health,
                 )
-            )
-        else:
-            response_items.append(ListingResponse.model_validate(item))
+                if item.battery_health is not None else None
+            ),
+            distance_km=(
+                round(_haversine(user_lat, user_long, item.location_lat, item.location_long), 1)
+                if geo_sort else None
+            ),
+        ))
+
+    next_cursor = None
+    if not geo_sort and len(items) == per_page:
+        next_cursor = _encode_cursor(items[-1])
 
     return PaginatedListingResponse(
         items=response_items,
         total=total,
-        page=page,
+        page=None if cursor else page,
         per_page=per_page,
-        pages=math.ceil(total / per_page) if total else 0,
+        pages=None if total is None else (math.ceil(total / per_page) if total else 0),
+        next_cursor=next_cursor,
     )
 
 
@@ -255,11 +413,25 @@ def list_listings(
     response_model=ListingResponse,
     summary="Get a single listing (public)",
 )
-def get_listing(listing_id: int, session: Session = Depends(get_session)):
-    listing = session.get(PhoneListing, listing_id)
+@listing_responses(ListingResponse, last_modified=lambda listing: listing.updated_at)
+def get_listing(
+    listing_id: int,
+    request: Request,
+    session: Session = Depends(get_session),
+):
+    # Revalidation first: a one-column lookup answers an unchanged
+    # listing with 304, before loading the row and its details.
+    updated_at = session.exec(
+        select(PhoneListing.updated_at).where(PhoneListing.id == listing_id)
+    ).first()
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="Listing not found.")
+    if not_modified_since(request, updated_at):
+        return Response(status_code=304, headers={"Last-Modified": http_date(updated_at)})
+
+    listing = _get_listing_with_details(session, listing_id)
     if not listing:
         raise HTTPException(status_code=404, detail="Listing not found.")
-    _load_details(listing)
     return listing
 
 
@@ -277,7 +449,7 @@ def update_listing(
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
-    listing = session.get(PhoneListing, listing_id)
+    listing = _get_listing_with_details(session, listing_id)
     if not listing:
         raise HTTPException(status_code=404, detail="Listing not found.")
     if listing.seller_id != current_user.id:
@@ -290,8 +462,7 @@ def update_listing(
 
     session.add(listing)
     session.commit()
-    session.refresh(listing)
-    _load_details(listing)
+    invalidate_listing_caches()
     return listing
 
 
@@ -317,3 +488,4 @@ def delete_listing(
     listing.is_active = False
     session.add(listing)
     session.commit()
+    invalidate_listing_caches()
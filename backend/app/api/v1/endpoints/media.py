@@ -2,21 +2,138 @@
 SMobile — Media Router
 
 File upload handling for listing images:
-  POST /upload  → Upload an image, return its public URL
+  POST /sign    → Presigned S3 POST; the client uploads straight to S3 (🔒)
+  POST /upload  → Upload an image through the app to local disk (dev fallback)
 """
 
 import uuid
 import os
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, status
+import boto3
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.security import get_current_user
+from app.models.user import User
+from app.schemas import MediaSignRequest, MediaSignResponse
 
 router = APIRouter()
 
 # ── Upload config ────────────────────────────
 ALLOWED_CONTENT_TYPES = {"image/jpeg", "image/png", "image/webp"}
+EXTENSIONS = {"image/jpeg": "jpg", "image/png": "png", "image/webp": "webp"}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
 UPLOAD_DIR = Path(__file__).resolve().parents[3] / "static" / "uploads"
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
+def _sniff_image_type(head: bytes) -> Optional[str]:
+    """Return the extension for a JPEG / PNG / WebP header, else None."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def _store_upload(src: BinaryIO) -> Tuple[str, int]:
+    """Copy an upload into UPLOAD_DIR chunk by chunk, checking its magic
+    bytes and size as it goes. Returns (filename, size).
+
+    Blocking file I/O — run via run_in_threadpool."""
+    head = src.read(CHUNK_SIZE)
+    ext = _sniff_image_type(head)
+    if ext is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File content is not a JPEG, PNG or WebP image.",
+        )
+
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = UPLOAD_DIR / f".{uuid.uuid4().hex}.part"
+    size = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            chunk = head
+            while chunk:
+                size += len(chunk)
+                if size > MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File too large. Max size is {MAX_FILE_SIZE // (1024*1024)} MB.",
+                    )
+                f.write(chunk)
+                chunk = src.read(CHUNK_SIZE)
+
+        unique_name = f"{uuid.uuid4().hex}.{ext}"
+        os.replace(tmp_path, UPLOAD_DIR / unique_name)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return unique_name, size
+
+
+@lru_cache(maxsize=1)
+def _s3_client():
+    # Clients are thread-safe and expensive to build; share one per worker
+    return boto3.client("s3", region_name=settings.S3_REGION)
+
+
+def _public_url(key: str) -> str:
+    base = settings.S3_PUBLIC_URL or (
+        f"https://{settings.S3_BUCKET}.s3.{settings.S3_REGION}.amazonaws.com"
+        if settings.S3_REGION else f"https://{settings.S3_BUCKET}.s3.amazonaws.com"
+    )
+    return f"{base.rstrip('/')}/{key}"
+
+
+@router.post(
+    "/sign",
+    response_model=MediaSignResponse,
+    summary="Sign a direct-to-S3 image upload (🔒)",
+)
+def sign_upload(
+    payload: MediaSignRequest,
+    current_user: User = Depends(get_current_user),
+):
+    if not settings.S3_BUCKET:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Direct uploads are not configured; use /media/upload.",
+        )
+    if payload.content_type not in ALLOWED_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid file type '{payload.content_type}'. "
+                   f"Allowed: {', '.join(ALLOWED_CONTENT_TYPES)}",
+        )
+
+    # Signing is local HMAC work — no call to S3. The policy pins the key,
+    # content type and size, so the bytes never pass through the app.
+    key = f"uploads/{uuid.uuid4().hex}.{EXTENSIONS[payload.content_type]}"
+    presigned = _s3_client().generate_presigned_post(
+        Bucket=settings.S3_BUCKET,
+        Key=key,
+        Fields={"Content-Type": payload.content_type},
+        Conditions=[
+            ["content-length-range", 1, MAX_FILE_SIZE],
+            {"Content-Type": payload.content_type},
+        ],
+        ExpiresIn=settings.S3_PRESIGN_EXPIRES,
+    )
+    return MediaSignResponse(
+        url=presigned["url"],
+        fields=presigned["fields"],
+        key=key,
+        public_url=_public_url(key),
+        expires_in=settings.S3_PRESIGN_EXPIRES,
+    )
 
 
 @router.post(
@@ -33,25 +150,11 @@ async def upload_image(file: UploadFile = File(...)):
                    f"Allowed: {', '.join(ALLOWED_CONTENT_TYPES)}",
         )
 
-    # ── Read file & validate size ────────────
-    contents = await file.read()
-    if len(contents) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File too large. Max size is {MAX_FILE_SIZE // (1024*1024)} MB.",
-        )
-
-    # ── Generate unique filename ─────────────
-    ext = file.filename.rsplit(".", 1)[-1] if file.filename and "." in file.filename else "jpg"
-    unique_name = f"{uuid.uuid4().hex}.{ext}"
-
-    # ── Save to disk ─────────────────────────
-    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-    file_path = UPLOAD_DIR / unique_name
-
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    # ── Stream to disk, validating as we go ──
+    # Never holds more than one chunk in memory; the extension comes from
+    # the sniffed content, not the client's filename.
+    unique_name, size = await run_in_threadpool(_store_upload, file.file)
 
     # ── Return public URL ────────────────────
     url = f"/static/uploads/{unique_name}"
-    return {"url": url, "filename": unique_name, "size": len(contents)}
+    return {"url": url, "filename": unique_name, "size": size}
@@ -1,36 +1,47 @@
 """
 SMobile — Orders Router
 
-Full order lifecycle with automatic chat room creation:
+Full order lifecycle with automatic chat room creation (after the
+response is sent — room ids appear on the order moments later):
 
   POST   /               → Place an order (🔒 buyer)
   GET    /               → List orders (admin sees all, users see their own)
   GET    /{id}           → Single order detail (🔒 buyer / seller / admin)
   PATCH  /{id}/status    → Update status (🔒 admin only)
+  POST   /{id}/chat-rooms → Re-run room setup that failed (🔒 admin only)
 """
 
-from typing import List, Optional
+import logging
+from threading import Lock
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from cachetools import TTLCache
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from sqlalchemy import exists, insert, update
+from sqlalchemy.orm import joinedload, selectinload
 from sqlmodel import Session, select, col
 
-from app.core.database import get_session
+from app.api.v1.endpoints.listings import invalidate_listing_caches
+from app.core.database import engine, get_session
 from app.core.security import get_current_user
 from app.models.user import User, UserRole
 from app.models.listing import PhoneListing
 from app.models.order import Order, OrderStatus
 from app.models.chat import ChatRoom, ChatParticipant, Message
-from app.schemas import OrderCreate, OrderResponse, OrderStatusUpdate
+from app.schemas import OrderCreate, OrderResponse, OrderResponseList, OrderStatusUpdate
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
 # ── Helper: enrich an Order with buyer/seller/listing info ──
 def _enrich_order(order: Order, session: Session) -> dict:
-    """Build a dict matching OrderResponse with enriched fields."""
-    buyer = session.get(User, order.buyer_id)
-    seller = session.get(User, order.seller_id)
-    listing = session.get(PhoneListing, order.listing_id)
+    """Build a dict matching OrderResponse with enriched fields.
+    Reads the relationships, so eager-loaded orders cost no queries."""
+    buyer = order.buyer
+    seller = order.seller_user
+    listing = order.listing
 
     return {
         "id": order.id,
@@ -50,41 +61,136 @@ def _enrich_order(order: Order, session: Session) -> dict:
     }
 
 
-# ── Helper: find any admin user ─────────────
-def _get_admin_user(session: Session) -> Optional[User]:
-    """Return the first admin user in the system."""
+# ── Helper: one order with its parties ──────
+def _get_order_with_parties(session: Session, order_id: int) -> Optional[Order]:
+    """Fetch an order joined to its buyer, seller and listing — one round
+    trip instead of a get plus three lazy loads in _enrich_order."""
     return session.exec(
-        select(User).where(User.role == UserRole.ADMIN).limit(1)
+        select(Order)
+        .where(Order.id == order_id)
+        .options(
+            joinedload(Order.buyer),
+            joinedload(Order.seller_user),
+            joinedload(Order.listing),
+        )
     ).first()
 
 
-# ── Helper: create a chat room with participants + system msg ─
-def _create_order_chat_room(
+# ── Helper: find any admin user ─────────────
+# Admins are seeded, not created per request, so the id is cached per
+# process. A miss (no admin yet) is not cached.
+ADMIN_ID_TTL_SECONDS = 60
+
+_admin_id_cache: TTLCache = TTLCache(maxsize=1, ttl=ADMIN_ID_TTL_SECONDS)
+_admin_id_lock = Lock()  # sync routes run concurrently in the threadpool
+
+
+def _get_admin_user_id(session: Session) -> Optional[int]:
+    """Return the id of the first admin user in the system."""
+    with _admin_id_lock:
+        admin_id = _admin_id_cache.get("id")
+    if admin_id is None:
+        admin_id = session.exec(
+            select(User.id).where(User.role == UserRole.ADMIN).limit(1)
+        ).first()
+        if admin_id is not None:
+            with _admin_id_lock:
+                _admin_id_cache["id"] = admin_id
+    return admin_id
+
+
+# ── Helper: create chat rooms with participants + system msgs ─
+def _create_order_chat_rooms(
     session: Session,
-    name: str,
     order_id: int,
-    participant_ids: List[int],
-    system_message: str,
-) -> ChatRoom:
-    """Create a ChatRoom, add participants, and post a system message."""
-    room = ChatRoom(name=name, order_id=order_id)
-    session.add(room)
-    session.flush()  # Get the room.id
-
-    for uid in participant_ids:
-        session.add(ChatParticipant(user_id=uid, room_id=room.id))
-
-    # System message from the first participant (admin if available)
-    admin = _get_admin_user(session)
-    sender_id = admin.id if admin else participant_ids[0]
-
-    session.add(Message(
-        room_id=room.id,
-        sender_id=sender_id,
-        content=system_message,
-    ))
+    admin_id: Optional[int],
+    rooms: List[Tuple[str, List[int], str]],
+) -> List[int]:
+    """Create (name, participant_ids, system_message) rooms for an order.
+
+    Three statements whatever the number of rooms: the rooms (INSERT ...
+    RETURNING id), every participant, every system message. Returns the
+    room ids in the order given."""
+    room_ids = session.exec(
+        insert(ChatRoom).returning(ChatRoom.id, sort_by_parameter_order=True),
+        params=[{"name": name, "order_id": order_id} for name, _, _ in rooms],
+    ).scalars().all()
+
+    session.exec(insert(ChatParticipant), params=[
+        {"user_id": uid, "room_id": room_id}
+        for room_id, (_, participant_ids, _) in zip(room_ids, rooms)
+        for uid in dict.fromkeys(participant_ids)   # no admin → ids can repeat
+    ])
+
+    # System message from the admin, else the first participant
+    session.exec(insert(Message), params=[
+        {
+            "room_id": room_id,
+            "sender_id": admin_id or participant_ids[0],
+            "content": system_message,
+        }
+        for room_id, (_, participant_ids, system_message) in zip(room_ids, rooms)
+    ])
+
+    return list(room_ids)
+
+
+def _setup_order_chat_rooms(
+    order_id: int,
+    buyer_id: int,
+    seller_id: int,
+    listing_title: str,
+) -> None:
+    """Create an order's two support rooms and link them, in its own
+    session. Does nothing if the order already has its rooms."""
+    with Session(engine) as session:
+        admin_id = _get_admin_user_id(session)
+
+        buyer_room_id, seller_room_id = _create_order_chat_rooms(
+            session=session,
+            order_id=order_id,
+            admin_id=admin_id,
+            rooms=[
+                # Room A: Buyer ↔ Admin (Buyer Support)
+                (
+                    f"Order #{order_id}: Buyer Support",
+                    [buyer_id, admin_id or buyer_id],
+                    f"Order #{order_id} created. An agent will be with you shortly.",
+                ),
+                # Room B: Seller ↔ Admin (Seller Coordination)
+                (
+                    f"Order #{order_id}: Seller Coordination",
+                    [seller_id, admin_id or buyer_id],
+                    f"Order #{order_id} created for your listing \"{listing_title}\". An agent will coordinate with you.",
+                ),
+            ],
+        )
 
-    return room
+        # Link rooms to the order — unless a concurrent run got there
+        # first, in which case this run's rooms are rolled back
+        linked = session.exec(
+            update(Order)
+            .where(Order.id == order_id, col(Order.buyer_chat_room_id).is_(None))
+            .values(buyer_chat_room_id=buyer_room_id, seller_chat_room_id=seller_room_id)
+            .returning(Order.id)
+        ).first()
+        if linked is None:
+            session.rollback()
+            return
+        session.commit()
+
+
+def _setup_order_chat_rooms_task(**kwargs) -> None:
+    """Background task wrapper: runs after the response is sent, so a
+    failure is logged with the order id for an admin to re-run."""
+    try:
+        _setup_order_chat_rooms(**kwargs)
+    except Exception:
+        logger.exception(
+            "Chat room setup failed for order %s; "
+            "retry with POST /orders/%s/chat-rooms",
+            kwargs["order_id"], kwargs["order_id"],
+        )
 
 
 # ═══════════════════════════════════════════════
@@ -98,11 +204,18 @@ def _create_order_chat_room(
 )
 def create_order(
     payload: OrderCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
     # ── Validate listing ─────────────────────
-    listing = session.get(PhoneListing, payload.listing_id)
+    # Row-locked until commit: a concurrent order for the same listing
+    # waits here and then sees it reserved, instead of reserving it twice.
+    listing = session.exec(
+        select(PhoneListing)
+        .where(PhoneListing.id == payload.listing_id)
+        .with_for_update()
+    ).first()
     if not listing or not listing.is_active:
         raise HTTPException(status_code=404, detail="Listing not found or no longer active.")
 
@@ -113,15 +226,16 @@ def create_order(
             detail="You cannot place an order on your own listing.",
         )
 
-    # Prevent duplicate pending orders
-    existing = session.exec(
-        select(Order).where(
+    # Prevent duplicate pending orders — EXISTS stops at the first hit in
+    # the partial pending-orders index, and no Order is built
+    has_pending = session.exec(
+        select(exists().where(
             Order.buyer_id == current_user.id,
             Order.listing_id == payload.listing_id,
             Order.status == OrderStatus.PENDING,
-        )
-    ).first()
-    if existing:
+        ))
+    ).one()
+    if has_pending:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You already have a pending order for this listing.",
@@ -136,42 +250,25 @@ def create_order(
         buyer_address=payload.buyer_address,
     )
     session.add(order)
-    session.flush()  # Get the order.id before creating chat rooms
 
     # ── Mark listing as reserved ─────────────
     listing.is_active = False
     session.add(listing)
 
-    # ── Auto-create chat rooms ───────────────
-    admin = _get_admin_user(session)
-    admin_id = admin.id if admin else current_user.id
-
-    # Room A: Buyer ↔ Admin (Buyer Support)
-    buyer_room = _create_order_chat_room(
-        session=session,
-        name=f"Order #{order.id}: Buyer Support",
-        order_id=order.id,
-        participant_ids=[current_user.id, admin_id],
-        system_message=f"Order #{order.id} created. An agent will be with you shortly.",
-    )
+    session.commit()
+    invalidate_listing_caches()  # the listing just left the public feed
 
-    # Room B: Seller ↔ Admin (Seller Coordination)
-    seller_room = _create_order_chat_room(
-        session=session,
-        name=f"Order #{order.id}: Seller Coordination",
+    # ── Auto-create chat rooms ───────────────
+    # Off the request path: the buyer doesn't need the rooms to see the
+    # order, and they are linked onto it once created.
+    background_tasks.add_task(
+        _setup_order_chat_rooms_task,
         order_id=order.id,
-        participant_ids=[listing.seller_id, admin_id],
-        system_message=f"Order #{order.id} created for your listing \"{listing.brand} {listing.model}\". An agent will coordinate with you.",
+        buyer_id=current_user.id,
+        seller_id=listing.seller_id,
+        listing_title=f"{listing.brand} {listing.model}",
     )
 
-    # Link rooms to the order
-    order.buyer_chat_room_id = buyer_room.id
-    order.seller_chat_room_id = seller_room.id
-    session.add(order)
-
-    session.commit()
-    session.refresh(order)
-
     return _enrich_order(order, session)
 
 
@@ -195,8 +292,21 @@ def list_orders(
             (Order.buyer_id == current_user.id) | (Order.seller_id == current_user.id)
         )
 
-    orders = session.exec(query.order_by(Order.created_at.desc())).all()
-    return [_enrich_order(o, session) for o in orders]
+    # Buyers, sellers and listings for every order in one SELECT each
+    orders = session.exec(
+        query.options(
+            selectinload(Order.buyer),
+            selectinload(Order.seller_user),
+            selectinload(Order.listing),
+        ).order_by(Order.created_at.desc())
+    ).all()
+    # The whole page is validated and rendered in two pydantic-core calls
+    return Response(
+        content=OrderResponseList.dump_json(
+            OrderResponseList.validate_python([_enrich_order(o, session) for o in orders])
+        ),
+        media_type="application/json",
+    )
 
 
 # ═══════════════════════════════════════════════
@@ -212,7 +322,7 @@ def get_order(
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
-    order = session.get(Order, order_id)
+    order = _get_order_with_parties(session, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found.")
 
@@ -245,7 +355,7 @@ def update_order_status(
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Only admins can update order status.")
 
-    order = session.get(Order, order_id)
+    order = _get_order_with_parties(session, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found.")
 
@@ -267,11 +377,51 @@ def update_order_status(
 
     # If cancelled, re-activate the listing
     if payload.status == OrderStatus.CANCELLED:
-        listing = session.get(PhoneListing, order.listing_id)
+        listing = order.listing
         if listing:
             listing.is_active = True
             session.add(listing)
 
     session.commit()
-    session.refresh(order)
+    if payload.status == OrderStatus.CANCELLED:
+        invalidate_listing_caches()  # the listing is back on the feed
+    return _enrich_order(order, session)
+
+
+# ═══════════════════════════════════════════════
+#  POST /{order_id}/chat-rooms — Admin-only room repair
+# ═══════════════════════════════════════════════
+@router.post(
+    "/{order_id}/chat-rooms",
+    response_model=OrderResponse,
+    summary="Create an order's missing chat rooms (🔒 admin only)",
+)
+def repair_order_chat_rooms(
+    order_id: int,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    # Admin only
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can set up order chat rooms.")
+
+    order = _get_order_with_parties(session, order_id)
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found.")
+    if order.buyer_chat_room_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Order already has its chat rooms.",
+        )
+
+    # Same setup the order's background task runs, here on the request
+    # path so a repeat failure reaches the admin as a 500
+    listing = order.listing
+    _setup_order_chat_rooms(
+        order_id=order.id,
+        buyer_id=order.buyer_id,
+        seller_id=order.seller_id,
+        listing_title=f"{listing.brand} {listing.model}" if listing else "",
+    )
+    session.refresh(order, ["buyer_chat_room_id", "seller_chat_room_id"])
     return _enrich_order(order, session)
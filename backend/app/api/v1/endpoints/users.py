@@ -5,11 +5,14 @@ SMobile — Users Router
   PUT  /me   → Update own profile (🔒)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from anyio import from_thread
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlmodel import Session
 
 from app.core.database import get_session
+from app.core.response_cache import http_date, not_modified_since
 from app.core.security import get_current_user
+from app.core.socket import manager
 from app.models.user import User
 from app.schemas import UserDetailResponse, UserUpdate
 
@@ -25,9 +28,19 @@ router = APIRouter()
     summary="Get current user profile (🔒)",
 )
 def get_me(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
+    # The user is already resolved; an unchanged profile is a bodiless
+    # 304 without loading seller_profile or serialising anything.
+    last_modified = http_date(current_user.updated_at)
+    if not_modified_since(request, current_user.updated_at):
+        return Response(status_code=304, headers={"Last-Modified": last_modified})
+
+    response.headers["Last-Modified"] = last_modified
+    response.headers["Cache-Control"] = "private, no-cache"
     # Touch seller_profile so it appears in the response
     _ = current_user.seller_profile
     return current_user
@@ -52,6 +65,7 @@ def update_me(
 
     session.add(current_user)
     session.commit()
-    session.refresh(current_user)
+    # Every worker holds its own auth cache; tell them all
+    from_thread.run(manager.publish_user_changed, current_user.id)
     _ = current_user.seller_profile
     return current_user
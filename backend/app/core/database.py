@@ -5,22 +5,65 @@ Provides the SQLModel engine, a session factory, and a FastAPI dependency
 for injecting database sessions into route handlers.
 """
 
+import logging
+import random
+import time
+
+from sqlalchemy import event
 from sqlmodel import Session, create_engine
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # ── Engine ───────────────────────────────────
+# No `echo`: formatting and writing every statement to stderr runs
+# synchronously on the request path. Slow queries are sampled below.
 engine = create_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,       # Log SQL in debug mode
+    echo_pool="debug" if settings.DB_ECHO_POOL else False,
     pool_pre_ping=True,        # Verify connections before use
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,   # Fail fast instead of queueing
+    pool_recycle=settings.DB_POOL_RECYCLE,   # Avoid server-side idle disconnects
+    # Room for every statement shape (each filter combination of the
+    # feed is its own entry) so hot queries like the auth-miss
+    # session.get(User) never fall out and get recompiled
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    # Multi-row INSERT ... VALUES for executemany inserts (up to 1000
+    # rows per statement), and psycopg2's execute_batch for executemany
+    # UPDATE/DELETE — one round-trip per page instead of one per row
+    insertmanyvalues_page_size=1000,
+    executemany_mode="values_plus_batch",
 )
 
 
+# ── Slow-query log ──────────────────────────
+@event.listens_for(engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the per-execution context, so a failed statement leaves nothing behind
+    context._query_start = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - context._query_start) * 1000
+    if (
+        elapsed_ms >= settings.DB_SLOW_QUERY_MS
+        and random.random() < settings.DB_SLOW_QUERY_SAMPLE_RATE
+    ):
+        logger.info(
+            "slow query",
+            extra={"duration_ms": round(elapsed_ms, 1), "statement": statement},
+        )
+
+
 # ── Dependency ───────────────────────────────
 def get_session():
-    """Yield a SQLModel session — used as a FastAPI dependency."""
-    with Session(engine) as session:
+    """Yield a SQLModel session — used as a FastAPI dependency.
+
+    Objects stay loaded after commit, so handlers can return what they
+    just wrote without a refresh SELECT."""
+    with Session(engine, expire_on_commit=False) as session:
         yield session
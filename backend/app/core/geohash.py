@@ -0,0 +1,76 @@
+"""
+SMobile — Geohash Helpers
+
+Encodes coordinates as geohash strings, so "within r km of a point"
+becomes a handful of indexed prefix scans instead of a haversine over
+every row.
+"""
+
+import math
+from typing import Set
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_KM_PER_DEGREE = 111.32
+
+# Precision stored on each listing (~153 m x 153 m cells)
+GEOHASH_PRECISION = 7
+
+
+def encode(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Geohash of a point, `precision` characters long."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # bits alternate longitude, latitude, starting with longitude
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            bit = lng >= mid
+            lng_lo, lng_hi = (mid, lng_hi) if bit else (lng_lo, mid)
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            bit = lat >= mid
+            lat_lo, lat_hi = (mid, lat_hi) if bit else (lat_lo, mid)
+        bits = (bits << 1) | bit
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def _cell_size(precision: int):
+    """(height, width) of a cell in degrees."""
+    lng_bits = math.ceil(5 * precision / 2)
+    lat_bits = 5 * precision - lng_bits
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def covering_prefixes(lat: float, lng: float, radius_km: float) -> Set[str]:
+    """Geohash prefixes whose cells together cover the box of `radius_km`
+    around a point — at most four, from the finest precision whose cells
+    are at least as large as the box. Empty when the box is too big for
+    any prefix to narrow the search."""
+    dlat = radius_km / _KM_PER_DEGREE
+    dlng = radius_km / (_KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+
+    precision = 0
+    for p in range(1, GEOHASH_PRECISION + 1):
+        height, width = _cell_size(p)
+        if height < 2 * dlat or width < 2 * dlng:
+            break
+        precision = p
+    if precision == 0:
+        return set()
+
+    south, north = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+    west, east = max(lng - dlng, -180.0), min(lng + dlng, 180.0)
+    return {
+        encode(corner_lat, corner_lng, precision)
+        for corner_lat in (south, north)
+        for corner_lng in (west, east)
+    }
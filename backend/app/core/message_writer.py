@@ -0,0 +1,100 @@
+"""
+SMobile — Batched Chat Message Writer
+
+Coalesces chat message INSERTs coming from every WebSocket on this
+worker. Messages queued within a short window are written with a single
+multi-row INSERT ... RETURNING and one commit, instead of one
+transaction (and one fsync) per message.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.database import engine
+from app.models.chat import Message
+
+
+def _insert_messages(rows: List[dict]) -> List[int]:
+    """Insert a batch of message rows, returning their ids in input order."""
+    with Session(engine) as session:
+        ids = session.exec(
+            insert(Message).returning(Message.id, sort_by_parameter_order=True),
+            params=rows,
+        ).scalars().all()
+        session.commit()
+    return list(ids)
+
+
+class MessageWriter:
+    """Write-behind buffer for chat messages.
+
+    `save()` queues a row and resolves with its database id once the
+    batch it landed in has been committed.
+    """
+
+    def __init__(self, window: float = 0.01, max_batch: int = 500):
+        self.window = window          # seconds to wait for more messages
+        self.max_batch = max_batch    # rows per INSERT statement
+        self._pending: List[Tuple[dict, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def save(
+        self, room_id: int, sender_id: int, content: str, timestamp: datetime
+    ) -> int:
+        """Queue a message for insertion and wait for its id."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(({
+            "room_id": room_id,
+            "sender_id": sender_id,
+            "content": content,
+            "timestamp": timestamp,
+        }, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_soon())
+        return await future
+
+    async def _flush_soon(self):
+        await asyncio.sleep(self.window)
+        batch, self._pending = self._pending, []
+        self._flush_task = None
+
+        for start in range(0, len(batch), self.max_batch):
+            await self._write(batch[start:start + self.max_batch])
+
+    async def _write(self, chunk: List[Tuple[dict, asyncio.Future]]):
+        try:
+            ids = await run_in_threadpool(_insert_messages, [row for row, _ in chunk])
+        except (IntegrityError, DataError) as exc:
+            if len(chunk) > 1:
+                # One bad row (e.g. its room was deleted meanwhile) fails
+                # the whole statement — retry row by row so only that
+                # row's sender sees the error
+                for entry in chunk:
+                    await self._write([entry])
+                return
+            self._fail(chunk, exc)
+            return
+        except Exception as exc:
+            # Outage, pool timeout, PgBouncer error: not the rows' fault,
+            # and retrying each one would only queue more waits
+            self._fail(chunk, exc)
+            return
+        for (_, future), message_id in zip(chunk, ids):
+            if not future.done():   # sender may have disconnected
+                future.set_result(message_id)
+
+    @staticmethod
+    def _fail(chunk: List[Tuple[dict, asyncio.Future]], exc: Exception):
+        for _, future in chunk:
+            if not future.done():
+                future.set_exception(exc)
+
+
+# Singleton instance shared across the application
+message_writer = MessageWriter()
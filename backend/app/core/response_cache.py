@@ -0,0 +1,123 @@
+"""
+SMobile — Public Response Cache
+
+Short-lived, per-process cache of rendered JSON bodies for public,
+read-only GET routes, with ETag / If-None-Match and Last-Modified /
+If-Modified-Since support. A repeat request skips the DB and
+serialisation; a browser that already holds the body gets a bodiless 304.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import wraps
+from threading import Lock
+from typing import Callable, Optional, Tuple, Type
+
+from cachetools import TTLCache
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+
+# ── Conditional GET helpers ─────────────────
+def _as_utc(value: datetime) -> datetime:
+    # Columns are timestamp without time zone, holding UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def http_date(value: datetime) -> str:
+    """Format a timestamp for a Last-Modified header."""
+    return format_datetime(_as_utc(value).replace(microsecond=0), usegmt=True)
+
+
+def not_modified_since(request: Request, last_modified: datetime) -> bool:
+    """True when the request's If-Modified-Since covers `last_modified`.
+
+    If-None-Match takes precedence when both are sent (RFC 9110 §13.2.2),
+    so this is False whenever the client sent an ETag."""
+    if "if-none-match" in request.headers:
+        return False
+    header = request.headers.get("if-modified-since")
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    # HTTP dates have one-second resolution
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+class ResponseCache:
+    """Rendered responses keyed on path + query string.
+
+    Use as a decorator on sync routes that accept `request: Request`;
+    call `clear()` after any write that changes what those routes serve.
+    A route may return a `Response` (e.g. its own 304) to bypass the cache.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30):
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = Lock()  # sync routes run concurrently in the threadpool
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __call__(
+        self,
+        model: Type[BaseModel],
+        last_modified: Optional[Callable[[object], datetime]] = None,
+    ) -> Callable:
+        """Cache the route's result, rendered as `model`.
+
+        `last_modified` picks the result's modification time; when given,
+        responses carry Last-Modified and honour If-Modified-Since."""
+        def decorator(endpoint: Callable) -> Callable:
+            @wraps(endpoint)
+            def wrapper(*args, **kwargs):
+                request: Request = kwargs["request"]
+                key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+                with self._lock:
+                    entry = self._entries.get(key)
+                if entry is None:
+                    result = endpoint(*args, **kwargs)
+                    if isinstance(result, Response):
+                        return result
+                    entry = self._render(model, result, last_modified)
+                    with self._lock:
+                        self._entries[key] = entry
+
+                body, etag, modified = entry
+                # no-cache: browsers keep the body but revalidate every time
+                headers = {"ETag": etag, "Cache-Control": "no-cache"}
+                if modified is not None:
+                    headers["Last-Modified"] = http_date(modified)
+                if_none_match = request.headers.get("if-none-match", "")
+                if etag in (tag.strip() for tag in if_none_match.split(",")) or (
+                    modified is not None and not_modified_since(request, modified)
+                ):
+                    return Response(status_code=304, headers=headers)
+                return Response(content=body, media_type="application/json", headers=headers)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def _render(
+        model: Type[BaseModel],
+        result,
+        last_modified: Optional[Callable[[object], datetime]],
+    ) -> Tuple[bytes, str, Optional[datetime]]:
+        modified = last_modified(result) if last_modified else None
+        if not isinstance(result, model):
+            result = model.model_validate(result)
+        body = result.model_dump_json().encode()
+        return body, f'"{hashlib.sha1(body).hexdigest()}"', modified
+
+
+# Public listing feed and detail pages
+listing_responses = ResponseCache(maxsize=1024, ttl=30)
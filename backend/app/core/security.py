@@ -5,60 +5,129 @@ Password hashing (bcrypt), JWT token creation / validation,
 and FastAPI dependencies for extracting the current user.
 """
 
-from datetime import datetime, timedelta, timezone
+import base64
+import hashlib
+import hmac
+import time
+from datetime import timedelta
+from threading import Lock
 from typing import Optional
 
+import bcrypt
+import jwt
+import orjson
+from cachetools import TLRUCache, TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlmodel import Session, select
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import Session
 
 from app.core.config import settings
 from app.core.database import get_session
 from app.models.user import User, UserRole
 
 # ── Password Hashing ────────────────────────
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# The bcrypt bindings directly, without passlib's scheme registry.
+# Hashes stay in the same $2b$ format, so existing ones keep verifying.
+BCRYPT_MAX_BYTES = 72  # bcrypt ignores the rest; newer releases reject it
+
+
+def _password_bytes(plain_password: str) -> bytes:
+    return plain_password.encode("utf-8")[:BCRYPT_MAX_BYTES]
 
 
 def hash_password(plain_password: str) -> str:
     """Hash a plain-text password using bcrypt."""
-    return pwd_context.hash(plain_password)
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(_password_bytes(plain_password), salt).decode("ascii")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain-text password against a bcrypt hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return bcrypt.checkpw(_password_bytes(plain_password), hashed_password.encode("ascii"))
 
 
 # ── JWT Configuration ───────────────────────
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
+# Encoded once instead of on every sign / verify
+_SECRET_KEY = settings.SECRET_KEY.encode()
+_JWT_HEADER = base64.urlsafe_b64encode(
+    orjson.dumps({"alg": ALGORITHM, "typ": "JWT"})
+).rstrip(b"=")
+
+
+def _b64url(raw: bytes) -> bytes:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
 
 def create_access_token(
     data: dict,
     expires_delta: Optional[timedelta] = None,
 ) -> str:
-    """Create a signed JWT access token."""
+    """Create a signed JWT access token.
+
+    HS256 is signed inline with the one-shot C `hmac.digest`, skipping
+    PyJWT's algorithm registry; PyJWT still does all verification."""
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + (
-        expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    )
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+    lifetime = expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode["exp"] = int(time.time() + lifetime.total_seconds())
+    signing_input = _JWT_HEADER + b"." + _b64url(orjson.dumps(to_encode))
+    signature = hmac.digest(_SECRET_KEY, signing_input, "sha256")
+    return (signing_input + b"." + _b64url(signature)).decode("ascii")
 
 
 def decode_access_token(token: str) -> dict:
-    """Decode and validate a JWT token. Raises JWTError on failure."""
-    return jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+    """Decode and validate a JWT token. Raises jwt.InvalidTokenError on failure."""
+    return jwt.decode(token, _SECRET_KEY, algorithms=[ALGORITHM])
 
 
 # ── OAuth2 Scheme ───────────────────────────
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
+# ── Auth Cache ──────────────────────────────
+# Two layers, so repeat requests skip both JWT verification and the users
+# lookup:
+#   token hash → (user_id, exp)   never outlives the token's own `exp`
+#   user_id    → detached user    merged back into the request session
+#                                 without a SELECT
+# Tokens are keyed by SHA-256 so raw credentials aren't held in memory,
+# and hashed_password is never part of a snapshot.
+TOKEN_CACHE_TTL_SECONDS = 30
+AUTH_CACHE_TTL_SECONDS = 60
+_AUTH_CACHE_FIELDS = ("id", "name", "phone", "email", "role", "created_at", "updated_at")
+
+
+def _token_ttu(_key, value, now: float) -> float:
+    _user_id, exp = value
+    return min(now + TOKEN_CACHE_TTL_SECONDS, exp)
+
+
+_token_cache: TLRUCache = TLRUCache(maxsize=10_000, ttu=_token_ttu, timer=time.time)
+_user_cache: TTLCache = TTLCache(maxsize=5_000, ttl=AUTH_CACHE_TTL_SECONDS)
+_auth_cache_lock = Lock()  # sync routes run concurrently in the threadpool
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
+def _snapshot_user(user: User) -> User:
+    snapshot = User(**{field: getattr(user, field) for field in _AUTH_CACHE_FIELDS})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop this worker's cached snapshot of `user_id`; every token for
+    the user reloads it on next use. After changing a user's profile or
+    role, call `manager.publish_user_changed` so every worker does this."""
+    with _auth_cache_lock:
+        _user_cache.pop(user_id, None)
+
+
 # ── Dependencies ────────────────────────────
 def get_current_user(
     token: str = Depends(oauth2_scheme),
@@ -73,17 +142,33 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        payload = decode_access_token(token)
-        user_id: Optional[int] = payload.get("sub")
-        if user_id is None:
+    key = _token_key(token)
+    with _auth_cache_lock:
+        verified = _token_cache.get(key)
+    if verified is None:
+        try:
+            payload = decode_access_token(token)
+            # A signed but non-numeric `sub` is a bad token, not a 500
+            user_id = int(payload["sub"])
+        except (jwt.InvalidTokenError, KeyError, ValueError, TypeError):
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-
-    user = session.get(User, int(user_id))
+        # A token without `exp` expires "now" and is simply not cached
+        verified = (user_id, payload.get("exp", 0))
+        with _auth_cache_lock:
+            _token_cache[key] = verified
+    user_id = verified[0]
+
+    with _auth_cache_lock:
+        cached = _user_cache.get(user_id)
+    if cached is not None:
+        return session.merge(cached, load=False)
+
+    user = session.get(User, user_id)
     if user is None:
         raise credentials_exception
+
+    with _auth_cache_lock:
+        _user_cache[user_id] = _snapshot_user(user)
     return user
 
 
@@ -4,13 +4,30 @@ SMobile — WebSocket Connection Manager
 Manages active WebSocket connections keyed by user ID.
 Provides helpers for connecting, disconnecting, and
 pushing messages to specific users in real-time.
+
+With REDIS_URL set, room broadcasts are published on a Redis channel
+that every worker listens to, so a message reaches its recipients
+whichever uvicorn worker their socket is attached to. Profile changes
+go out on a second channel, so each worker drops its cached copy of
+the user.
 """
 
-import json
-from typing import Dict, List, Optional
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
 
+import orjson
+import redis.asyncio as redis
+from cachetools import TTLCache
 from fastapi import WebSocket
 
+from app.core.security import invalidate_cached_user
+
+logger = logging.getLogger(__name__)
+
+CHAT_CHANNEL = "smobile:chat"
+USER_CHANNEL = "smobile:users"
+
 
 class ConnectionManager:
     """In-memory WebSocket connection pool.
@@ -21,37 +38,141 @@ class ConnectionManager:
 
     def __init__(self):
         self.active_connections: Dict[int, WebSocket] = {}
+        # user_id → that socket's bound send_text, resolved once at connect
+        # so a broadcast fans out without per-recipient attribute lookups
+        self._senders: Dict[int, Callable[[str], Awaitable[None]]] = {}
+        # room_id → participant user ids. Participants are fixed when a
+        # room is created, so entries never go stale; the TTL only bounds
+        # memory for rooms that have gone quiet.
+        self.room_members: TTLCache = TTLCache(maxsize=10_000, ttl=600)
+        self._redis: Optional[redis.Redis] = None
+        self._listener: Optional[asyncio.Task] = None
 
+    # ── Lifecycle ────────────────────────────
+    async def start(self, redis_url: Optional[str]):
+        """Enable cross-worker fan-out via Redis pub/sub.
+        Without a URL, broadcasts only reach sockets on this worker."""
+        if not redis_url:
+            return
+        self._redis = redis.from_url(redis_url)
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(CHAT_CHANNEL, USER_CHANNEL)
+        self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def stop(self):
+        """Stop the Redis listener and close the connection pool."""
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._redis:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _listen(self, pubsub):
+        """Deliver broadcasts published by any worker to local sockets."""
+        while True:
+            try:
+                async for item in pubsub.listen():
+                    if item["type"] != "message":
+                        continue
+                    if item["channel"] == USER_CHANNEL.encode():
+                        invalidate_cached_user(int(item["data"]))
+                        continue
+                    # Routing header, newline, then the message exactly as
+                    # the publisher encoded it — only the header is parsed
+                    header, _, body = item["data"].partition(b"\n")
+                    envelope = orjson.loads(header)
+                    await self._deliver(
+                        body.decode(),
+                        envelope["participant_ids"],
+                        envelope["exclude_id"],
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Redis went away — back off, redis-py resubscribes on reconnect
+                logger.exception("Chat pub/sub listener failed; retrying")
+                await asyncio.sleep(1)
+
+    # ── Connections ──────────────────────────
     async def connect(self, websocket: WebSocket, user_id: int):
         """Accept the WebSocket handshake and register the user."""
         await websocket.accept()
         self.active_connections[user_id] = websocket
+        self._senders[user_id] = websocket.send_text
 
     def disconnect(self, user_id: int):
         """Remove a user from the active pool."""
         self.active_connections.pop(user_id, None)
+        self._senders.pop(user_id, None)
 
     def is_online(self, user_id: int) -> bool:
         """Check if a user currently has an open socket."""
         return user_id in self.active_connections
 
+    # ── Messaging ────────────────────────────
     async def send_personal_message(self, message: dict, user_id: int):
         """Send a JSON message to a specific user if they are online."""
         ws = self.active_connections.get(user_id)
         if ws:
             try:
-                await ws.send_json(message)
+                await ws.send_text(orjson.dumps(message).decode())
             except Exception:
                 # Socket broken — remove silently
                 self.disconnect(user_id)
 
+    async def _deliver(
+        self, text: str, participant_ids: List[int], exclude_id: Optional[int]
+    ):
+        """Send an encoded message to the participants connected to this
+        worker.
+
+        Sends run concurrently, so one slow socket doesn't hold up the
+        rest of the room."""
+        targets = [
+            (uid, self._senders[uid])
+            for uid in participant_ids
+            if uid != exclude_id and uid in self._senders
+        ]
+        if not targets:
+            return
+        results = await asyncio.gather(
+            *(send(text) for _, send in targets), return_exceptions=True
+        )
+        for (uid, send), result in zip(targets, results):
+            # Socket broken — drop it, unless the user has since reconnected
+            if isinstance(result, Exception) and self._senders.get(uid) is send:
+                self.disconnect(uid)
+
     async def broadcast_to_room(
         self, message: dict, participant_ids: List[int], exclude_id: Optional[int] = None
     ):
-        """Send a message to all online participants of a room."""
-        for uid in participant_ids:
-            if uid != exclude_id:
-                await self.send_personal_message(message, uid)
+        """Send a message to all online participants of a room.
+
+        The message is serialised once, here; every worker forwards those
+        same bytes to its sockets."""
+        body = orjson.dumps(message)
+        if self._redis is None:
+            await self._deliver(body.decode(), participant_ids, exclude_id)
+            return
+        header = orjson.dumps({
+            "participant_ids": participant_ids,
+            "exclude_id": exclude_id,
+        })
+        # Compact orjson output never contains a raw newline
+        await self._redis.publish(CHAT_CHANNEL, header + b"\n" + body)
+
+    # ── Auth cache ───────────────────────────
+    async def publish_user_changed(self, user_id: int):
+        """Drop the cached snapshot of `user_id` on every worker, this one
+        included, so no token keeps serving the old profile or role."""
+        invalidate_cached_user(user_id)
+        if self._redis is not None:
+            await self._redis.publish(USER_CHANNEL, str(user_id))
 
 
 # Singleton instance shared across the application
@@ -7,13 +7,16 @@ and handles database table creation on startup.
 
 from contextlib import asynccontextmanager
 
+from anyio import to_thread
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from sqlmodel import SQLModel
 
 from app.core.config import settings
 from app.core.database import engine
+from app.core.socket import manager
 from app.api import api_router
 
 # ── Import all models so SQLModel registers them ──
@@ -26,10 +29,20 @@ from app.models.chat import ChatRoom, ChatParticipant, Message  # noqa: F401
 # ── Lifespan ─────────────────────────────────
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Create database tables on startup (dev convenience).
+    """Create database tables on startup (dev convenience, skipped when
+    AUTO_CREATE_TABLES is off) and start the chat pub/sub listener.
     In production, use Alembic migrations instead."""
-    SQLModel.metadata.create_all(engine)
+    # Sync routes run in AnyIO's threadpool, 40 threads by default. Match
+    # it to the DB pool so a burst can use every connection, rather than
+    # leaving connections idle while requests queue for a thread.
+    to_thread.current_default_thread_limiter().total_tokens = (
+        settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    )
+    if settings.AUTO_CREATE_TABLES:
+        SQLModel.metadata.create_all(engine)
+    await manager.start(settings.REDIS_URL)
     yield
+    await manager.stop()
 
 
 # ── App Factory ──────────────────────────────
@@ -37,6 +50,7 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     version="0.4.0",
     description="Enterprise-level API for the SMobile phone marketplace.",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
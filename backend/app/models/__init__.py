@@ -0,0 +1,18 @@
+"""
+SMobile — Models
+
+Shared column defaults for the table models.
+"""
+
+from datetime import datetime, timezone
+
+_UTC = timezone.utc
+
+
+def utcnow() -> datetime:
+    """Current UTC time — default/onupdate for every timestamp column.
+
+    Naive, like the `timestamp without time zone` columns return it: with
+    expire_on_commit=False a just-created row is served from memory, and
+    must serialize the same as when it is read back."""
+    return datetime.now(_UTC).replace(tzinfo=None)
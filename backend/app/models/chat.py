@@ -7,11 +7,14 @@ Database models for the real-time chat system:
   Message           → Individual chat messages within a room
 """
 
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional, List, TYPE_CHECKING
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
+from app.models import utcnow
+
 if TYPE_CHECKING:
     from app.models.user import User
     from app.models.order import Order
@@ -25,7 +28,7 @@ class ChatRoom(SQLModel, table=True):
     name: str = Field(max_length=200, default="Chat")
     order_id: Optional[int] = Field(default=None, foreign_key="orders.id", index=True)
     is_active: bool = Field(default=True)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=utcnow)
 
     # ── Relationships ────────────────────────
     participants: List["ChatParticipant"] = Relationship(back_populates="room")
@@ -35,11 +38,14 @@ class ChatRoom(SQLModel, table=True):
 # ── Chat Participant (Many-to-Many) ──────────
 class ChatParticipant(SQLModel, table=True):
     __tablename__ = "chat_participants"
+    __table_args__ = (
+        Index("uq_chat_participants_user_room", "user_id", "room_id", unique=True),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="users.id", index=True)
+    user_id: int = Field(foreign_key="users.id")
     room_id: int = Field(foreign_key="chat_rooms.id", index=True)
-    joined_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    joined_at: datetime = Field(default_factory=utcnow)
 
     # ── Relationships ────────────────────────
     room: Optional[ChatRoom] = Relationship(back_populates="participants")
@@ -48,12 +54,21 @@ class ChatParticipant(SQLModel, table=True):
 # ── Message ──────────────────────────────────
 class Message(SQLModel, table=True):
     __tablename__ = "messages"
+    __table_args__ = (
+        # History pages (Postgres scans it backwards for timestamp DESC)
+        Index("ix_messages_room_ts", "room_id", "timestamp"),
+        # Unread counts — partial, only unread rows are indexed
+        Index(
+            "ix_messages_room_unread", "room_id", "sender_id",
+            postgresql_where=text("read_at IS NULL"),
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    room_id: int = Field(foreign_key="chat_rooms.id", index=True)
+    room_id: int = Field(foreign_key="chat_rooms.id")   # leads ix_messages_room_ts
     sender_id: int = Field(foreign_key="users.id", index=True)
     content: str = Field(max_length=2000)
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp: datetime = Field(default_factory=utcnow)
     read_at: Optional[datetime] = Field(default=None)
 
     # ── Relationships ────────────────────────
@@ -3,10 +3,15 @@ SMobile — Phone Listing, OldPhoneDetails & NewPhoneDetails Models
 """
 
 import enum
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional, List, TYPE_CHECKING
 
-from sqlmodel import Field, Relationship, SQLModel, Column, JSON, Enum as SAEnum
+from sqlalchemy import DDL, Index, String, event, func
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import Field, Relationship, SQLModel, Column, Enum as SAEnum
+
+from app.core import geohash
+from app.models import utcnow
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -22,6 +27,24 @@ class PhoneType(str, enum.Enum):
 # ── Phone Listing ────────────────────────────
 class PhoneListing(SQLModel, table=True):
     __tablename__ = "phone_listings"
+    __table_args__ = (
+        # Keyset pagination of the public feed (scanned backwards for DESC)
+        Index("ix_phone_listings_active_created", "is_active", "created_at", "id"),
+        # Substring search — trigram GIN indexes serve ILIKE '%q%'
+        Index(
+            "ix_phone_listings_brand_trgm", "brand",
+            postgresql_using="gin", postgresql_ops={"brand": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_phone_listings_model_trgm", "model",
+            postgresql_using="gin", postgresql_ops={"model": "gin_trgm_ops"},
+        ),
+        # Radius search — geohash LIKE 'prefix%' as an index range scan
+        Index(
+            "ix_phone_listings_geohash", "geohash",
+            postgresql_ops={"geohash": "varchar_pattern_ops"},
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     seller_id: int = Field(foreign_key="users.id", index=True)
@@ -35,13 +58,21 @@ class PhoneListing(SQLModel, table=True):
     ram: str = Field(max_length=50)           # e.g. "8GB"
     storage: str = Field(max_length=50)       # e.g. "128GB"
     main_image_url: str = Field(max_length=500)
+    # Native text[] — the driver builds the list itself, no JSON decode per row
     additional_images: Optional[List[str]] = Field(
-        default=None, sa_column=Column(JSON)
+        default=None, sa_column=Column(ARRAY(String(500)))
     )
     location_lat: float
     location_long: float
+    # Derived from the coordinates on every insert/update (see below)
+    geohash: Optional[str] = Field(default=None, max_length=12)
     is_active: bool = Field(default=True)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=utcnow)
+    # Bumped on every UPDATE; served as Last-Modified
+    updated_at: datetime = Field(
+        default_factory=utcnow,
+        sa_column_kwargs={"onupdate": utcnow},
+    )
 
     # ── Relationships ────────────────────────
     seller: Optional["User"] = Relationship(back_populates="listings")
@@ -50,6 +81,29 @@ class PhoneListing(SQLModel, table=True):
     orders: List["Order"] = Relationship(back_populates="listing")
 
 
+# Case-insensitive brand filter on the public feed (active rows only)
+Index(
+    "ix_phone_listings_brand_lower",
+    func.lower(PhoneListing.brand),
+    postgresql_where=PhoneListing.is_active,
+)
+
+# Keep geohash in step with the coordinates for ORM writes
+@event.listens_for(PhoneListing, "before_insert")
+@event.listens_for(PhoneListing, "before_update")
+def _set_geohash(mapper, connection, listing: PhoneListing):
+    listing.geohash = geohash.encode(listing.location_lat, listing.location_long)
+
+
+# gin_trgm_ops lives in pg_trgm; make sure it exists before create_all
+# builds the trigram indexes
+event.listen(
+    PhoneListing.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
 # ── Old Phone Details ────────────────────────
 class OldPhoneDetails(SQLModel, table=True):
     __tablename__ = "old_phone_details"
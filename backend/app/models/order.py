@@ -6,11 +6,14 @@ Includes references to auto-created chat rooms for support.
 """
 
 import enum
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel, Column, Enum as SAEnum
 
+from app.models import utcnow
+
 if TYPE_CHECKING:
     from app.models.user import User
     from app.models.listing import PhoneListing
@@ -27,11 +30,22 @@ class OrderStatus(str, enum.Enum):
 # ── Order ────────────────────────────────────
 class Order(SQLModel, table=True):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Duplicate pending-order check — partial, only open orders indexed
+        Index(
+            "ix_orders_buyer_listing_pending", "buyer_id", "listing_id",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+        # A user's orders, newest first — one index per side of the
+        # buyer_id = ? OR seller_id = ? lookup; both also serve the FKs
+        Index("ix_orders_buyer_created", "buyer_id", "created_at"),
+        Index("ix_orders_seller_created", "seller_id", "created_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    buyer_id: int = Field(foreign_key="users.id", index=True)
+    buyer_id: int = Field(foreign_key="users.id")
     listing_id: int = Field(foreign_key="phone_listings.id", index=True)
-    seller_id: int = Field(foreign_key="users.id", index=True)
+    seller_id: int = Field(foreign_key="users.id")
     status: OrderStatus = Field(
         sa_column=Column(SAEnum(OrderStatus), nullable=False, default=OrderStatus.PENDING)
     )
@@ -41,7 +55,7 @@ class Order(SQLModel, table=True):
     buyer_chat_room_id: Optional[int] = Field(default=None, foreign_key="chat_rooms.id")
     seller_chat_room_id: Optional[int] = Field(default=None, foreign_key="chat_rooms.id")
 
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=utcnow)
 
     # ── Relationships ────────────────────────
     buyer: Optional["User"] = Relationship(
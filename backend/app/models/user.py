@@ -3,11 +3,14 @@ SMobile — User & Seller Profile Models
 """
 
 import enum
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional, List, TYPE_CHECKING
 
+from sqlalchemy import Index, func
 from sqlmodel import Field, Relationship, SQLModel, Column, Enum as SAEnum
 
+from app.models import utcnow
+
 if TYPE_CHECKING:
     from app.models.listing import PhoneListing
     from app.models.order import Order
@@ -32,7 +35,12 @@ class User(SQLModel, table=True):
     role: UserRole = Field(
         sa_column=Column(SAEnum(UserRole), nullable=False, default=UserRole.BUYER)
     )
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=utcnow)
+    # Bumped on every UPDATE; served as Last-Modified
+    updated_at: datetime = Field(
+        default_factory=utcnow,
+        sa_column_kwargs={"onupdate": utcnow},
+    )
 
     # ── Relationships ────────────────────────
     seller_profile: Optional["SellerProfile"] = Relationship(back_populates="user")
@@ -62,3 +70,7 @@ class SellerProfile(SQLModel, table=True):
 
     # ── Relationships ────────────────────────
     user: Optional[User] = Relationship(back_populates="seller_profile")
+
+
+# Case-insensitive city filter on the public feed
+Index("ix_seller_profiles_city_lower", func.lower(SellerProfile.city))
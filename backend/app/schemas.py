@@ -6,9 +6,9 @@ Separated from SQLModel table models to keep the API layer clean.
 """
 
 import re
-from typing import Optional, List, Union
+from typing import Dict, Optional, List
 
-from pydantic import BaseModel, EmailStr, field_validator, model_validator
+from pydantic import BaseModel, EmailStr, TypeAdapter, field_validator, model_validator
 
 from app.models.user import UserRole
 from app.models.listing import PhoneType
@@ -18,6 +18,14 @@ from app.models.listing import PhoneType
 #  AUTH SCHEMAS
 # ═══════════════════════════════════════════════
 
+# Validator patterns, compiled once at import
+_RE_UPPER = re.compile(r"[A-Z]")
+_RE_LOWER = re.compile(r"[a-z]")
+_RE_DIGIT = re.compile(r"\d")
+_RE_PHONE_SEPARATORS = re.compile(r"[\s\-()]")
+_RE_PHONE = re.compile(r"^\+?\d{10,15}$")
+
+
 # ── Registration ─────────────────────────────
 class SellerProfileCreate(BaseModel):
     """Optional seller location data provided during registration."""
@@ -43,19 +51,19 @@ class UserCreate(BaseModel):
     def validate_password_strength(cls, v: str) -> str:
         if len(v) < 8:
             raise ValueError("Password must be at least 8 characters long.")
-        if not re.search(r"[A-Z]", v):
+        if not _RE_UPPER.search(v):
             raise ValueError("Password must contain at least one uppercase letter.")
-        if not re.search(r"[a-z]", v):
+        if not _RE_LOWER.search(v):
             raise ValueError("Password must contain at least one lowercase letter.")
-        if not re.search(r"\d", v):
+        if not _RE_DIGIT.search(v):
             raise ValueError("Password must contain at least one digit.")
         return v
 
     @field_validator("phone")
     @classmethod
     def validate_phone(cls, v: str) -> str:
-        cleaned = re.sub(r"[\s\-()]", "", v)
-        if not re.match(r"^\+?\d{10,15}$", cleaned):
+        cleaned = _RE_PHONE_SEPARATORS.sub("", v)
+        if not _RE_PHONE.match(cleaned):
             raise ValueError("Phone number must be 10-15 digits, optionally starting with +.")
         return cleaned
 
@@ -222,19 +230,35 @@ class ListingUpdate(BaseModel):
         return v
 
 
-# ── Listing With Distance ───────────────────
-class ListingWithDistanceResponse(ListingResponse):
-    """ListingResponse extended with a calculated distance_km field."""
-    distance_km: float
+# ── Listing Card (feed item) ────────────────
+class ListingCardOldDetails(BaseModel):
+    pta_approved: bool
+    battery_health: int
+
+
+class ListingCardResponse(BaseModel):
+    """Just the fields the listing grid renders; full detail lives on
+    GET /listings/{id}."""
+    id: int
+    type: PhoneType
+    brand: str
+    model: str
+    price: float
+    ram: str
+    storage: str
+    main_image_url: str
+    old_phone_details: Optional[ListingCardOldDetails] = None
+    distance_km: Optional[float] = None  # only with user_lat/user_long
 
 
 # ── Paginated Response ──────────────────────
 class PaginatedListingResponse(BaseModel):
-    items: List[Union[ListingWithDistanceResponse, ListingResponse]]
-    total: int
-    page: int
+    items: List[ListingCardResponse]
+    total: Optional[int] = None        # omitted on cursor pages unless include_total
+    page: Optional[int] = None         # None on cursor pages
     per_page: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # pass back as `cursor` for the next page
 
 
 # ═══════════════════════════════════════════════
@@ -308,3 +332,31 @@ class UserUpdate(BaseModel):
     name: Optional[str] = None
     email: Optional[EmailStr] = None
 
+
+# ═══════════════════════════════════════════════
+#  MEDIA SCHEMAS
+# ═══════════════════════════════════════════════
+
+class MediaSignRequest(BaseModel):
+    """Payload for POST /media/sign — the image type about to be uploaded."""
+    content_type: str
+
+
+class MediaSignResponse(BaseModel):
+    """Presigned S3 POST: send `fields` plus the file as multipart to `url`,
+    then use `public_url` as the listing image."""
+    url: str
+    fields: Dict[str, str]
+    key: str
+    public_url: str
+    expires_in: int
+
+
+# ═══════════════════════════════════════════════
+#  LIST ADAPTERS
+# ═══════════════════════════════════════════════
+# Built once; validate a whole page of rows and dump it to JSON bytes in
+# single pydantic-core calls instead of per-item Python work.
+UserResponseList = TypeAdapter(List[UserResponse])
+ListingResponseList = TypeAdapter(List[ListingResponse])
+OrderResponseList = TypeAdapter(List[OrderResponse])
@@ -9,505 +9,280 @@ Usage:
     uv run python -m app.seed
 """
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import orjson
+from sqlalchemy import exists, insert, inspect, text
 from sqlmodel import Session, select, SQLModel
-from app.core.database import engine
-from app.core.security import hash_password
-from app.models.user import User, UserRole, SellerProfile
-from app.models.listing import PhoneListing, PhoneType, OldPhoneDetails, NewPhoneDetails
-
-# ── Ensure all models are registered ──
-from app.models.order import Order            # noqa: F401
-from app.models.chat import ChatRoom, ChatParticipant, Message  # noqa: F401
-
-
-def seed():
-    # Create tables if they don't exist
-    SQLModel.metadata.create_all(engine)
-
-    with Session(engine) as session:
-        # Check if data already exists
-        existing = session.exec(select(User)).first()
-        if existing:
-            print("⚠️  Database already has data. Skipping seed.")
-            print("   To re-seed, drop all tables first or clear the database.")
-            return
 
-        print("🌱 Seeding database...")
 
-        # ════════════════════════════════════════
-        # 1. USERS
-        # ════════════════════════════════════════
-        admin = User(
-            name="Admin SMobile",
-            phone="+923001111111",
-            email="admin@smobile.pk",
-            hashed_password=hash_password("Admin@123"),
-            role=UserRole.ADMIN,
-        )
+logger = logging.getLogger(__name__)
 
-        seller1 = User(
-            name="Ali Khan",
-            phone="+923002222222",
-            email="ali.khan@email.com",
-            hashed_password=hash_password("Seller@123"),
-            role=UserRole.SELLER,
-        )
+# Static catalog: phone images (Unsplash, free to use) and the listings
+# that use them, keyed by seller email
+_CATALOG_PATH = Path(__file__).parent / "seed_data" / "listings.json"
 
-        seller2 = User(
-            name="Fatima Noor",
-            phone="+923003333333",
-            email="fatima.noor@email.com",
-            hashed_password=hash_password("Seller@123"),
-            role=UserRole.SELLER,
-        )
+# Catalog keys that are not PhoneListing columns
+_NON_COLUMN_KEYS = ("seller", "image", "new_phone", "old_phone")
 
-        seller3 = User(
-            name="Hassan Mobile Zone",
-            phone="+923004444444",
-            email="hassan.mobile@email.com",
-            hashed_password=hash_password("Seller@123"),
-            role=UserRole.SELLER,
-        )
 
-        seller4 = User(
-            name="Gadget Future",
-            phone="+923007777777",
-            email="gadget.future@email.com",
-            hashed_password=hash_password("Seller@123"),
-            role=UserRole.SELLER,
-        )
+# Printed once the seed commits
+_ACCOUNTS_SUMMARY = """
+══════════════════════════════════════════════════
+🎉 Seed complete! Here are the test accounts:
+══════════════════════════════════════════════════
 
-        buyer1 = User(
-            name="Ahmed Raza",
-            phone="+923005555555",
-            email="ahmed.raza@email.com",
-            hashed_password=hash_password("Buyer@123"),
-            role=UserRole.BUYER,
-        )
+  👑 ADMIN
+     Phone: +923001111111
+     Pass:  Admin@123
 
-        buyer2 = User(
-            name="Sara Malik",
-            phone="+923006666666",
-            email="sara.malik@email.com",
-            hashed_password=hash_password("Buyer@123"),
-            role=UserRole.BUYER,
-        )
+  🏪 SELLERS
+     Ali Khan:           +923002222222 / Seller@123
+     Fatima Noor:        +923003333333 / Seller@123
+     Hassan Mobile Zone: +923004444444 / Seller@123
+     Gadget Future:      +923007777777 / Seller@123
 
-        session.add_all([admin, seller1, seller2, seller3, seller4, buyer1, buyer2])
-        session.flush()
-        print(f"   ✅ Created {7} users (1 admin, 4 sellers, 2 buyers)")
+  🛒 BUYERS
+     Ahmed Raza:  +923005555555 / Buyer@123
+     Sara Malik:  +923006666666 / Buyer@123
+"""
 
-        # ════════════════════════════════════════
-        # 2. SELLER PROFILES
-        # ════════════════════════════════════════
-        profiles = [
-            SellerProfile(
-                user_id=seller1.id,
-                address="Shop #12, Hall Road Mobile Market",
-                city="Lahore",
-                latitude=31.5204,
-                longitude=74.3587,
-                is_shop=True,
-                shop_name="Ali Mobile Hub",
-            ),
-            SellerProfile(
-                user_id=seller2.id,
-                address="Flat 5B, Clifton Block 4",
-                city="Karachi",
-                latitude=24.8607,
-                longitude=67.0011,
-                is_shop=False,
-                shop_name=None,
-            ),
-            SellerProfile(
-                user_id=seller3.id,
-                address="Shop 45, Saddar Bazaar",
-                city="Rawalpindi",
-                latitude=33.6007,
-                longitude=73.0679,
-                is_shop=True,
-                shop_name="Hassan Mobile Zone",
-            ),
-            SellerProfile(
-                user_id=seller4.id,
-                address="Shop 88, Hafeez Center",
-                city="Lahore",
-                latitude=31.5039,
-                longitude=74.3415,
-                is_shop=True,
-                shop_name="Gadget Future",
-            ),
-        ]
-        session.add_all(profiles)
-        session.flush()
-        print(f"   ✅ Created {len(profiles)} seller profiles")
 
-        # ════════════════════════════════════════
-        # 3. PHONE LISTINGS
-        # ════════════════════════════════════════
+@lru_cache
+def _load_catalog() -> dict:
+    """Parse the listing catalog once per process."""
+    return orjson.loads(_CATALOG_PATH.read_bytes())
 
-        # ── High-quality phone images (Unsplash, free to use) ──
-        IMG = {
-            "samsung_s24":    "https://images.unsplash.com/photo-1610945265064-0e34e5519bbf?w=800&q=80",
-            "samsung_a54":    "https://images.unsplash.com/photo-1598327105666-5b89351aff97?w=800&q=80",
-            "samsung_z_flip": "https://images.unsplash.com/photo-1628744876497-eb30460be9f6?w=800&q=80",
-            "iphone_15":      "https://images.unsplash.com/photo-1695048133142-1a20484d2569?w=800&q=80",
-            "iphone_14":      "https://images.unsplash.com/photo-1678685888221-cda773a3dcdb?w=800&q=80",
-            "iphone_13":      "https://images.unsplash.com/photo-1632633173522-47456de71b68?w=800&q=80",
-            "xiaomi_14":      "https://images.unsplash.com/photo-1511707171634-5f897ff02aa9?w=800&q=80",
-            "oneplus_12":     "https://images.unsplash.com/photo-1585060544812-6b45742d762f?w=800&q=80",
-            "pixel_8":        "https://images.unsplash.com/photo-1598327105666-5b89351aff97?w=800&q=80",
-            "oppo_reno":      "https://images.unsplash.com/photo-1574944985070-8f3ebc6b79d2?w=800&q=80",
-            "realme_gt":      "https://images.unsplash.com/photo-1605236453806-6ff36851218e?w=800&q=80",
-            "infinix_note":   "https://images.unsplash.com/photo-1592899677977-9c10ca588bbd?w=800&q=80",
-            "nothing_phone":  "https://images.unsplash.com/photo-1691426462947-8aed7f42c2c5?w=800&q=80",
-            "pixel_9":        "https://images.unsplash.com/photo-1696614488390-e88df2cb0b89?w=800&q=80",
-            "sony_xperia":    "https://images.unsplash.com/photo-1601784551446-20c9e07cdbdb?w=800&q=80",
-            "asus_rog":       "https://images.unsplash.com/photo-1626245084931-e1fcc13251e6?w=800&q=80",
-        }
 
-        listings_data = [
-            # ── NEW PHONES ──────────────────────
+def seed(fresh: bool = False):
+    """Create the tables and load the sample data, unless users already
+    exist. Pass `fresh=True` only right after the schema was dropped."""
+    # Imported here, not at module level: the engine, bcrypt and every
+    # model only load when a seed actually runs, so `import app.seed`
+    # stays cheap for anything that just wants the function
+    from app.core import geohash
+    from app.core.database import engine
+    from app.core.security import hash_password
+    from app.models.user import User, UserRole, SellerProfile
+    from app.models.listing import PhoneListing, OldPhoneDetails, NewPhoneDetails
+
+    # ── Ensure all models are registered ──
+    from app.models.order import Order            # noqa: F401
+    from app.models.chat import ChatRoom, ChatParticipant, Message  # noqa: F401
+
+    if fresh:
+        # Known-empty database: plain CREATEs, no per-table existence probes
+        SQLModel.metadata.create_all(engine, checkfirst=False)
+    else:
+        # Create tables if they don't exist — one catalog query first, so a
+        # re-run against a complete schema skips create_all's per-table probes
+        existing_tables = set(inspect(engine).get_table_names())
+        if not existing_tables.issuperset(SQLModel.metadata.tables):
+            SQLModel.metadata.create_all(engine)
+
+    # Nothing is ever added to this session (every write is an INSERT
+    # statement), so there is nothing for autoflush to do before each one
+    with Session(engine, autoflush=False) as session:
+        # Check if data already exists — EXISTS stops at the first row and
+        # returns a bool, no User gets built
+        has_users = session.exec(select(exists().select_from(User))).one()
+        if has_users:
+            logger.warning(
+                "⚠️  Database already has data. Skipping seed.\n"
+                "   To re-seed, drop all tables first or clear the database."
+            )
+            return
+
+        logger.info("🌱 Seeding database...")
+
+        # Don't wait for the WAL flush at commit — a crash mid-seed just
+        # means seeding again. LOCAL scopes it to this transaction only.
+        session.execute(text("SET LOCAL synchronous_commit = off"))
+
+        # ════════════════════════════════════════
+        # 1. USERS
+        # ════════════════════════════════════════
+        user_rows = [
             {
-                "seller_id": seller1.id,
-                "type": PhoneType.NEW,
-                "brand": "Samsung",
-                "model": "Galaxy S24 Ultra",
-                "price": 329999,
-                "ram": "12GB",
-                "storage": "256GB",
-                "main_image_url": IMG["samsung_s24"],
-                "location_lat": 31.5204,
-                "location_long": 74.3587,
-                "new_phone": {
-                    "processor": "Snapdragon 8 Gen 3",
-                    "battery_mah": 5000,
-                },
+                "name": "Admin SMobile",
+                "phone": "+923001111111",
+                "email": "admin@smobile.pk",
+                "password": "Admin@123",
+                "role": UserRole.ADMIN,
             },
             {
-                "seller_id": seller1.id,
-                "type": PhoneType.NEW,
-                "brand": "Apple",
-                "model": "iPhone 15 Pro Max",
-                "price": 459999,
-                "ram": "8GB",
-                "storage": "256GB",
-                "main_image_url": IMG["iphone_15"],
-                "location_lat": 31.5204,
-                "location_long": 74.3587,
-                "new_phone": {
-                    "processor": "A17 Pro Bionic",
-                    "battery_mah": 4441,
-                },
+                "name": "Ali Khan",
+                "phone": "+923002222222",
+                "email": "ali.khan@email.com",
+                "password": "Seller@123",
+                "role": UserRole.SELLER,
             },
             {
-                "seller_id": seller3.id,
-                "type": PhoneType.NEW,
-                "brand": "OnePlus",
-                "model": "12 5G",
-                "price": 179999,
-                "ram": "12GB",
-                "storage": "256GB",
-                "main_image_url": IMG["oneplus_12"],
-                "location_lat": 33.6007,
-                "location_long": 73.0679,
-                "new_phone": {
-                    "processor": "Snapdragon 8 Gen 3",
-                    "battery_mah": 5400,
-                },
+                "name": "Fatima Noor",
+                "phone": "+923003333333",
+                "email": "fatima.noor@email.com",
+                "password": "Seller@123",
+                "role": UserRole.SELLER,
             },
             {
-                "seller_id": seller3.id,
-                "type": PhoneType.NEW,
-                "brand": "Samsung",
-                "model": "Galaxy Z Flip 5",
-                "price": 249999,
-                "ram": "8GB",
-                "storage": "256GB",
-                "main_image_url": IMG["samsung_z_flip"],
-                "location_lat": 33.6007,
-                "location_long": 73.0679,
-                "new_phone": {
-                    "processor": "Snapdragon 8 Gen 2",
-                    "battery_mah": 3700,
-                },
+                "name": "Hassan Mobile Zone",
+                "phone": "+923004444444",
+                "email": "hassan.mobile@email.com",
+                "password": "Seller@123",
+                "role": UserRole.SELLER,
             },
             {
-                "seller_id": seller1.id,
-                "type": PhoneType.NEW,
-                "brand": "Xiaomi",
-                "model": "14 Pro",
-                "price": 149999,
-                "ram": "12GB",
-                "storage": "256GB",
-                "main_image_url": IMG["xiaomi_14"],
-                "location_lat": 31.5204,
-                "location_long": 74.3587,
-                "new_phone": {
-                    "processor": "Snapdragon 8 Gen 3",
-                    "battery_mah": 4880,
-                },
+                "name": "Gadget Future",
+                "phone": "+923007777777",
+                "email": "gadget.future@email.com",
+                "password": "Seller@123",
+                "role": UserRole.SELLER,
             },
             {
-                "seller_id": seller4.id,
-                "type": PhoneType.NEW,
-                "brand": "Nothing",
-                "model": "Phone (2)",
-                "price": 129999,
-                "ram": "12GB",
-                "storage": "256GB",
-                "main_image_url": IMG["nothing_phone"],
-                "location_lat": 31.5039,
-                "location_long": 74.3415,
-                "new_phone": {
-                    "processor": "Snapdragon 8+ Gen 1",
-                    "battery_mah": 4700,
-                },
+                "name": "Ahmed Raza",
+                "phone": "+923005555555",
+                "email": "ahmed.raza@email.com",
+                "password": "Buyer@123",
+                "role": UserRole.BUYER,
             },
             {
-                "seller_id": seller4.id,
-                "type": PhoneType.NEW,
-                "brand": "Google",
-                "model": "Pixel 9 Pro",
-                "price": 209999,
-                "ram": "16GB",
-                "storage": "512GB",
-                "main_image_url": IMG["pixel_9"],
-                "location_lat": 31.5039,
-                "location_long": 74.3415,
-                "new_phone": {
-                    "processor": "Google Tensor G4",
-                    "battery_mah": 5000,
-                },
+                "name": "Sara Malik",
+                "phone": "+923006666666",
+                "email": "sara.malik@email.com",
+                "password": "Buyer@123",
+                "role": UserRole.BUYER,
             },
+        ]
 
-            # ── USED / OLD PHONES ───────────────
-            {
-                "seller_id": seller2.id,
-                "type": PhoneType.OLD,
-                "brand": "Apple",
-                "model": "iPhone 14 Pro",
-                "price": 239999,
-                "ram": "6GB",
-                "storage": "128GB",
-                "main_image_url": IMG["iphone_14"],
-                "location_lat": 24.8607,
-                "location_long": 67.0011,
-                "old_phone": {
-                    "battery_health": 89,
-                    "battery_mah": 3200,
-                    "pta_approved": True,
-                    "accessories": "Original box, charger, EarPods",
-                    "condition_rating": 8,
-                    "defect_details": "Minor scratch on back glass, barely visible",
-                },
-            },
-            {
-                "seller_id": seller2.id,
-                "type": PhoneType.OLD,
-                "brand": "Apple",
-                "model": "iPhone 13",
-                "price": 149999,
-                "ram": "4GB",
-                "storage": "128GB",
-                "main_image_url": IMG["iphone_13"],
-                "location_lat": 24.8607,
-                "location_long": 67.0011,
-                "old_phone": {
-                    "battery_health": 82,
-                    "battery_mah": 3240,
-                    "pta_approved": True,
-                    "accessories": "Charger only",
-                    "condition_rating": 7,
-                    "defect_details": None,
-                },
-            },
-            {
-                "seller_id": seller1.id,
-                "type": PhoneType.OLD,
-                "brand": "Samsung",
-                "model": "Galaxy A54 5G",
-                "price": 54999,
-                "ram": "8GB",
-                "storage": "128GB",
-                "main_image_url": IMG["samsung_a54"],
-                "location_lat": 31.5204,
-                "location_long": 74.3587,
-                "old_phone": {
-                    "battery_health": 91,
-                    "battery_mah": 5000,
-                    "pta_approved": True,
-                    "accessories": "Box, charger, back cover",
-                    "condition_rating": 9,
-                    "defect_details": None,
-                },
-            },
-            {
-                "seller_id": seller3.id,
-                "type": PhoneType.OLD,
-                "brand": "Google",
-                "model": "Pixel 8 Pro",
-                "price": 139999,
-                "ram": "12GB",
-                "storage": "128GB",
-                "main_image_url": IMG["pixel_8"],
-                "location_lat": 33.6007,
-                "location_long": 73.0679,
-                "old_phone": {
-                    "battery_health": 95,
-                    "battery_mah": 5050,
-                    "pta_approved": False,
-                    "accessories": "Original box and charger",
-                    "condition_rating": 9,
-                    "defect_details": "Non-PTA, works with all SIMs via CPID",
-                },
-            },
-            {
-                "seller_id": seller2.id,
-                "type": PhoneType.OLD,
-                "brand": "Oppo",
-                "model": "Reno 10 Pro+",
-                "price": 84999,
-                "ram": "12GB",
-                "storage": "256GB",
-                "main_image_url": IMG["oppo_reno"],
-                "location_lat": 24.8607,
-                "location_long": 67.0011,
-                "old_phone": {
-                    "battery_health": 87,
-                    "battery_mah": 4700,
-                    "pta_approved": True,
-                    "accessories": "Charger, back cover",
-                    "condition_rating": 8,
-                    "defect_details": "Small dent on bottom edge",
-                },
-            },
+        # Accounts sharing a password share its hash — a fresh salt per
+        # seed user buys nothing. bcrypt releases the GIL while it
+        # stretches the key, so the distinct hashes run side by side.
+        passwords = sorted({row["password"] for row in user_rows})
+        with ThreadPoolExecutor(max_workers=len(passwords)) as pool:
+            hashed = dict(zip(passwords, pool.map(hash_password, passwords)))
+        for row in user_rows:
+            row["hashed_password"] = hashed[row.pop("password")]
+
+        # One INSERT for every user; RETURNING maps each email to its new id
+        email_to_id = dict(
+            session.execute(insert(User).returning(User.email, User.id), user_rows).all()
+        )
+        seller1_id = email_to_id["ali.khan@email.com"]
+        seller2_id = email_to_id["fatima.noor@email.com"]
+        seller3_id = email_to_id["hassan.mobile@email.com"]
+        seller4_id = email_to_id["gadget.future@email.com"]
+        logger.info("   ✅ Created %d users (1 admin, 4 sellers, 2 buyers)", len(user_rows))
+
+        # ════════════════════════════════════════
+        # 2. SELLER PROFILES
+        # ════════════════════════════════════════
+        profile_rows = [
             {
-                "seller_id": seller1.id,
-                "type": PhoneType.OLD,
-                "brand": "Realme",
-                "model": "GT 5 Pro",
-                "price": 89999,
-                "ram": "12GB",
-                "storage": "256GB",
-                "main_image_url": IMG["realme_gt"],
-                "location_lat": 31.5204,
-                "location_long": 74.3587,
-                "old_phone": {
-                    "battery_health": 93,
-                    "battery_mah": 5400,
-                    "pta_approved": True,
-                    "accessories": "Full box with all accessories",
-                    "condition_rating": 9,
-                    "defect_details": None,
-                },
+                "user_id": seller1_id,
+                "address": "Shop #12, Hall Road Mobile Market",
+                "city": "Lahore",
+                "latitude": 31.5204,
+                "longitude": 74.3587,
+                "is_shop": True,
+                "shop_name": "Ali Mobile Hub",
             },
             {
-                "seller_id": seller3.id,
-                "type": PhoneType.OLD,
-                "brand": "Infinix",
-                "model": "Note 30 Pro",
-                "price": 42999,
-                "ram": "8GB",
-                "storage": "256GB",
-                "main_image_url": IMG["infinix_note"],
-                "location_lat": 33.6007,
-                "location_long": 73.0679,
-                "old_phone": {
-                    "battery_health": 96,
-                    "battery_mah": 5000,
-                    "pta_approved": True,
-                    "accessories": "Charger, earphones",
-                    "condition_rating": 8,
-                    "defect_details": "Screen protector has bubbles, screen itself is perfect",
-                },
+                "user_id": seller2_id,
+                "address": "Flat 5B, Clifton Block 4",
+                "city": "Karachi",
+                "latitude": 24.8607,
+                "longitude": 67.0011,
+                "is_shop": False,
+                "shop_name": None,
             },
             {
-                "seller_id": seller4.id,
-                "type": PhoneType.OLD,
-                "brand": "Sony",
-                "model": "Xperia 1 V",
-                "price": 99999,
-                "ram": "12GB",
-                "storage": "256GB",
-                "main_image_url": IMG["sony_xperia"],
-                "location_lat": 31.5039,
-                "location_long": 74.3415,
-                "old_phone": {
-                    "battery_health": 90,
-                    "battery_mah": 5000,
-                    "pta_approved": True,
-                    "accessories": "Box and charger",
-                    "condition_rating": 9,
-                    "defect_details": None,
-                },
+                "user_id": seller3_id,
+                "address": "Shop 45, Saddar Bazaar",
+                "city": "Rawalpindi",
+                "latitude": 33.6007,
+                "longitude": 73.0679,
+                "is_shop": True,
+                "shop_name": "Hassan Mobile Zone",
             },
             {
-                "seller_id": seller4.id,
-                "type": PhoneType.OLD,
-                "brand": "Asus",
-                "model": "ROG Phone 8",
-                "price": 159999,
-                "ram": "16GB",
-                "storage": "512GB",
-                "main_image_url": IMG["asus_rog"],
-                "location_lat": 31.5039,
-                "location_long": 74.3415,
-                "old_phone": {
-                    "battery_health": 95,
-                    "battery_mah": 5500,
-                    "pta_approved": True,
-                    "accessories": "Full gaming kit",
-                    "condition_rating": 9,
-                    "defect_details": None,
-                },
+                "user_id": seller4_id,
+                "address": "Shop 88, Hafeez Center",
+                "city": "Lahore",
+                "latitude": 31.5039,
+                "longitude": 74.3415,
+                "is_shop": True,
+                "shop_name": "Gadget Future",
             },
         ]
+        session.execute(insert(SellerProfile), profile_rows)
+        logger.info("   ✅ Created %d seller profiles", len(profile_rows))
 
-        for data in listings_data:
-            new_phone_data = data.pop("new_phone", None)
-            old_phone_data = data.pop("old_phone", None)
+        # ════════════════════════════════════════
+        # 3. PHONE LISTINGS
+        # ════════════════════════════════════════
 
-            listing = PhoneListing(**data)
-            session.add(listing)
-            session.flush()
+        catalog = _load_catalog()
+        images = catalog["images"]
+        listings_data = catalog["listings"]
 
-            if new_phone_data:
-                detail = NewPhoneDetails(listing_id=listing.id, **new_phone_data)
-                session.add(detail)
+        # Listings sit at their seller's shop — coordinates (and the
+        # geohash, which bulk inserts don't fill in) are worked out once
+        # per seller, not once per listing
+        seller_location = {
+            row["user_id"]: {
+                "location_lat": row["latitude"],
+                "location_long": row["longitude"],
+                "geohash": geohash.encode(row["latitude"], row["longitude"]),
+            }
+            for row in profile_rows
+        }
+
+        def listing_row(data: dict) -> dict:
+            seller_id = email_to_id[data["seller"]]
+            return {
+                **{k: v for k, v in data.items() if k not in _NON_COLUMN_KEYS},
+                "seller_id": seller_id,
+                "main_image_url": images[data["image"]],
+                **seller_location[seller_id],
+            }
 
-            if old_phone_data:
-                detail = OldPhoneDetails(listing_id=listing.id, **old_phone_data)
-                session.add(detail)
+        # New and used listings go in as separate batches, each followed by
+        # its own detail table — no per-row branching on the listing type.
+        # RETURNING hands back the generated ids in row order.
+        new_data = [data for data in listings_data if "new_phone" in data]
+        old_data = [data for data in listings_data if "old_phone" in data]
+        for batch, details_model, details_key in (
+            (new_data, NewPhoneDetails, "new_phone"),
+            (old_data, OldPhoneDetails, "old_phone"),
+        ):
+            ids = session.scalars(
+                insert(PhoneListing).returning(PhoneListing.id, sort_by_parameter_order=True),
+                [listing_row(data) for data in batch],
+            ).all()
+            details_rows = [
+                {"listing_id": listing_id, **data[details_key]}
+                for listing_id, data in zip(ids, batch)
+            ]
+            session.execute(insert(details_model), details_rows)
 
-        session.flush()
-        print(f"   ✅ Created {len(listings_data)} phone listings (5 new, 7 used)")
+        logger.info(
+            "   ✅ Created %d phone listings (%d new, %d used)",
+            len(listings_data), len(new_data), len(old_data),
+        )
 
         # ════════════════════════════════════════
         # 4. COMMIT
         # ════════════════════════════════════════
+        # The whole seed is one transaction: no flushes in between, the
+        # ids come back from RETURNING, and a failure leaves nothing behind
         session.commit()
 
-        print()
-        print("═" * 50)
-        print("🎉 Seed complete! Here are the test accounts:")
-        print("═" * 50)
-        print()
-        print("  👑 ADMIN")
-        print("     Phone: +923001111111")
-        print("     Pass:  Admin@123")
-        print()
-        print("  🏪 SELLERS")
-        print("     Ali Khan:           +923002222222 / Seller@123")
-        print("     Fatima Noor:        +923003333333 / Seller@123")
-        print("     Hassan Mobile Zone: +923004444444 / Seller@123")
-        print("     Gadget Future:      +923007777777 / Seller@123")
-        print()
-        print("  🛒 BUYERS")
-        print("     Ahmed Raza:  +923005555555 / Buyer@123")
-        print("     Sara Malik:  +923006666666 / Buyer@123")
-        print()
+        logger.info(_ACCOUNTS_SUMMARY)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     seed()
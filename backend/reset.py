@@ -1,6 +1,9 @@
 """
 Resets the database by dropping all tables and re-seeding.
 """
+import logging
+
+from sqlalchemy import text
 from sqlmodel import SQLModel
 from app.core.database import engine
 from app.seed import seed
@@ -11,17 +14,30 @@ from app.models.listing import PhoneListing, OldPhoneDetails, NewPhoneDetails
 from app.models.order import Order
 from app.models.chat import ChatRoom, ChatParticipant, Message
 
+logger = logging.getLogger(__name__)
+
 def reset_and_seed():
-    print("WARNING: This will delete all data in the database.")
-    print("🗑️  Dropping all tables from metadata...")
-    # This drops tables associated with the imported models
-    SQLModel.metadata.drop_all(engine)
-    print("✅  Tables dropped.")
+    logger.warning("WARNING: This will delete all data in the database.")
+    if engine.dialect.name == "postgresql":
+        # One statement instead of a DROP per table (and per enum type)
+        logger.info("🗑️  Dropping the public schema...")
+        with engine.begin() as conn:
+            conn.execute(text("DROP SCHEMA public CASCADE"))
+            conn.execute(text("CREATE SCHEMA public"))
+        logger.info("✅  Schema recreated.")
+    else:
+        logger.info("🗑️  Dropping all tables from metadata...")
+        # This drops tables associated with the imported models
+        SQLModel.metadata.drop_all(engine)
+        logger.info("✅  Tables dropped.")
     
     # Run the seed function
-    # Note: seed() calls SQLModel.metadata.create_all(engine)
-    print("🌱 Starting seed process...")
-    seed()
+    # Note: seed() calls SQLModel.metadata.create_all(engine) — no
+    # existence checks needed, everything was just dropped
+    logger.info("🌱 Starting seed process...")
+    seed(fresh=True)
 
 if __name__ == "__main__":
+    # seed() reports through logging; show its progress alongside ours
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     reset_and_seed()
@@ -0,0 +1,100 @@
+"""
+Detail endpoints must serialize without lazy loads.
+
+Every ORM query in these tests runs with raiseload("*"), so any
+relationship the response touches but the query didn't eager-load
+raises instead of quietly issuing another SELECT.
+"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import raiseload
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.api.v1.endpoints.listings import _get_listing_with_details
+from app.api.v1.endpoints.orders import _enrich_order, _get_order_with_parties
+from app.models.chat import ChatRoom  # noqa: F401 — registers the table
+from app.models.listing import NewPhoneDetails, OldPhoneDetails, PhoneListing, PhoneType
+from app.models.order import Order
+from app.models.user import User, UserRole
+from app.schemas import ListingResponse, OrderResponse
+
+
+# The tests run on in-memory SQLite; additional_images stays NULL here,
+# so the column only needs to be creatable
+@compiles(ARRAY, "sqlite")
+def _array_as_text(type_, compiler, **kw):
+    return "TEXT"
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def ids(engine):
+    with Session(engine) as session:
+        seller = User(name="Seller", phone="+920000000001", hashed_password="x", role=UserRole.SELLER)
+        buyer = User(name="Buyer", phone="+920000000002", hashed_password="x", role=UserRole.BUYER)
+        session.add_all([seller, buyer])
+        session.flush()
+
+        listing_fields = dict(
+            seller_id=seller.id, ram="8GB", storage="128GB",
+            main_image_url="https://example.com/phone.jpg",
+            location_lat=31.52, location_long=74.35,
+        )
+        new = PhoneListing(type=PhoneType.NEW, brand="Samsung", model="S24", price=1000, **listing_fields)
+        old = PhoneListing(type=PhoneType.OLD, brand="Apple", model="iPhone 13", price=500, **listing_fields)
+        session.add_all([new, old])
+        session.flush()
+
+        session.add(NewPhoneDetails(listing_id=new.id, processor="Snapdragon", battery_mah=5000))
+        session.add(OldPhoneDetails(listing_id=old.id, battery_health=90, battery_mah=3200, condition_rating=8))
+        order = Order(buyer_id=buyer.id, seller_id=seller.id, listing_id=new.id)
+        session.add(order)
+        session.commit()
+        return {"new": new.id, "old": old.id, "order": order.id}
+
+
+@pytest.fixture
+def strict_session(engine):
+    """A fresh session whose every ORM SELECT carries raiseload("*")."""
+    with Session(engine) as session:
+        @event.listens_for(session, "do_orm_execute")
+        def _no_lazy_loads(state):
+            if state.is_select:
+                state.statement = state.statement.options(raiseload("*"))
+
+        yield session
+
+
+@pytest.mark.parametrize("kind", ["new", "old"])
+def test_listing_detail_needs_no_lazy_loads(strict_session, ids, kind):
+    listing = _get_listing_with_details(strict_session, ids[kind])
+
+    response = ListingResponse.model_validate(listing)
+
+    details = response.new_phone_details if kind == "new" else response.old_phone_details
+    assert details is not None
+
+
+def test_order_detail_needs_no_lazy_loads(strict_session, ids):
+    order = _get_order_with_parties(strict_session, ids["order"])
+
+    response = OrderResponse.model_validate(_enrich_order(order, strict_session))
+
+    assert response.buyer_name == "Buyer"
+    assert response.seller_name == "Seller"
+    assert response.listing_title == "Samsung S24"
@@ -36,6 +36,8 @@ export default function ChatWindow({ roomId, className }: ChatWindowProps) {
         messages,
         setMessages,
         addMessage,
+        ackMessage,
+        failMessage,
         setActiveRoom,
         isConnected,
         setConnected,
@@ -103,6 +105,10 @@ export default function ChatWindow({ roomId, className }: ChatWindowProps) {
                 if (data.type === "message") {
                     addMessage(data as ChatMessage);
                     scrollToBottom();
+                } else if (data.type === "message_ack") {
+                    ackMessage(data.provisional_id, data.id);
+                } else if (data.type === "message_failed") {
+                    failMessage(data.provisional_id);
                 }
             } catch {
                 // ignore malformed messages
@@ -121,7 +127,7 @@ export default function ChatWindow({ roomId, className }: ChatWindowProps) {
             ws.close();
             setConnected(false);
         };
-    }, [user?.id, token, addMessage, setConnected, scrollToBottom]);
+    }, [user?.id, token, addMessage, ackMessage, failMessage, setConnected, scrollToBottom]);
 
     // ── Auto-scroll on new messages ─────────
     useEffect(() => {
@@ -4,10 +4,10 @@ import Image from "next/image";
 import Link from "next/link";
 import { MapPin, Cpu, HardDrive, BatteryMedium, ShieldCheck, ShieldX } from "lucide-react";
 import { cn } from "@/lib/utils";
-import type { PhoneListing } from "@/types";
+import type { ListingSummary } from "@/types";
 
 interface ListingCardProps {
-    listing: PhoneListing;
+    listing: ListingSummary;
 }
 
 export default function ListingCard({ listing }: ListingCardProps) {
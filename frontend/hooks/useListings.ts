@@ -9,10 +9,10 @@
 
 import { useState, useEffect, useCallback, useRef } from "react";
 import api from "@/lib/api";
-import type { PhoneListing, ListingFilters, PaginatedListings } from "@/types";
+import type { ListingSummary, ListingFilters, PaginatedListings } from "@/types";
 
 interface UseListingsReturn {
-    listings: PhoneListing[];
+    listings: ListingSummary[];
     total: number;
     pages: number;
     page: number;
@@ -22,7 +22,7 @@ interface UseListingsReturn {
 }
 
 export function useListings(filters: ListingFilters = {}): UseListingsReturn {
-    const [listings, setListings] = useState<PhoneListing[]>([]);
+    const [listings, setListings] = useState<ListingSummary[]>([]);
     const [total, setTotal] = useState(0);
     const [pages, setPages] = useState(0);
     const [page, setPage] = useState(1);
@@ -4,6 +4,8 @@ const nextConfig: NextConfig = {
   output: "standalone",
   reactCompiler: true,
   images: {
+    // AVIF first for browsers that accept it (~20% smaller than WebP)
+    formats: ["image/avif", "image/webp"],
     remotePatterns: [
       {
         protocol: "https",
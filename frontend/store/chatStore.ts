@@ -21,6 +21,8 @@ interface ChatState {
     setActiveRoom: (roomId: number | null) => void;
     setMessages: (messages: ChatMessage[]) => void;
     addMessage: (msg: ChatMessage) => void;
+    ackMessage: (provisionalId: number, id: number) => void;
+    failMessage: (provisionalId: number) => void;
     setConnected: (val: boolean) => void;
     updateUnreadCount: (roomId: number, count: number) => void;
     reset: () => void;
@@ -72,6 +74,20 @@ export const useChatStore = create<ChatState>((set, get) => ({
         });
     },
 
+    // Swap a message's provisional (negative) id for its database id
+    ackMessage: (provisionalId, id) =>
+        set({
+            messages: get().messages.map((m) =>
+                m.id === provisionalId ? { ...m, id } : m
+            ),
+        }),
+
+    // Drop a message the server failed to save
+    failMessage: (provisionalId) =>
+        set({
+            messages: get().messages.filter((m) => m.id !== provisionalId),
+        }),
+
     setConnected: (val) => set({ isConnected: val }),
 
     updateUnreadCount: (roomId, count) =>
@@ -76,12 +76,29 @@ export interface PhoneListing {
     distance_km?: number | null;
 }
 
+/** Feed item — the subset of a listing the grid card renders */
+export interface ListingSummary {
+    id: number;
+    type: PhoneType;
+    brand: string;
+    model: string;
+    price: number;
+    ram: string;
+    storage: string;
+    main_image_url: string;
+    old_phone_details?: Pick<OldPhoneDetails, "pta_approved" | "battery_health"> | null;
+    /** Calculated field — only present when user_lat/user_long provided */
+    distance_km?: number | null;
+}
+
 export interface PaginatedListings {
-    items: PhoneListing[];
+    items: ListingSummary[];
     total: number;
     page: number;
     per_page: number;
     pages: number;
+    /** Keyset cursor for the next page (absent with nearby sort) */
+    next_cursor?: string | null;
 }
 
 // ── Filters ─────────────────────────────────